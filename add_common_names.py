@@ -71,8 +71,8 @@ def add_common_names():
         "yojana", "pm", "jan", "dhan", "yojana", "pm", "suraksha", "bima", "yojana"
     ]
     
-    # All custom words
-    all_custom_words = indian_names + technical_terms + company_names
+    # All custom words (the lists above repeat several names, so build a set directly)
+    all_custom_words = {*indian_names, *technical_terms, *company_names}
     
     # Load existing custom words if they exist
     existing_words = set()
@@ -85,8 +85,8 @@ def add_common_names():
             print(f"Could not load existing custom words: {e}")
     
     # Add new words
-    new_words = set(all_custom_words) - existing_words
-    all_words = existing_words.union(new_words)
+    new_words = all_custom_words - existing_words
+    all_words = existing_words | all_custom_words
     
     # Save to file
     data = {
@@ -1,21 +1,258 @@
 import string
 import re
+import math
+import bisect
+import heapq
+import sys
 from collections import Counter
+from functools import lru_cache
 import editdistance
 import numpy as np
 import nltk
+from nltk.corpus import brown, reuters
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Lowercase letters as byte values for the bytearray-based edit1
+LETTER_BYTES = string.ascii_lowercase.encode()
+
+# Tokenizer for the corpus file, compiled once at import time
+TOKEN_RE = re.compile(r'\w+')
+
+# StringZilla provides a SIMD Levenshtein kernel for ASCII words; fall back to editdistance if it isn't installed
+try:
+    from stringzilla import edit_distance as sz_edit_distance
+except ImportError:
+    sz_edit_distance = None
+
+# Numba compiles the batch scoring kernel below; without it the per-candidate Python scoring is used
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def adjacent_transposition(word1, word2):
+    # Checking whether the two words differ only by one swap of adjacent characters.
+    # Levenshtein distance counts such a swap as two edits, while edit1 treats it as one.
+    if len(word1) != len(word2):
+        return False
+    diff = [i for i, (c1, c2) in enumerate(zip(word1, word2)) if c1 != c2]
+    return (len(diff) == 2 and diff[1] == diff[0] + 1
+            and word1[diff[0]] == word2[diff[1]] and word1[diff[1]] == word2[diff[0]])
+
+
+@lru_cache(maxsize=8192)
+def edit1_variants(word):
+    # All strings one edit (insert, delete, replace or adjacent swap) away from the word.
+    # Cached per word: edit2 calls this for every 1-edit variant, and users retype the same words.
+
+    # Non-ASCII words can't be edited byte by byte, so they keep the string-slicing version
+    if not word.isascii():
+        letter = string.ascii_lowercase
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+        edits = set()
+        edits.update(l + c + r for l, r in splits for c in letter)  # Insert
+        edits.update(l + r[1:] for l, r in splits if r)  # Delete
+        edits.update(l + c + r[1:] for l, r in splits if r for c in letter)  # Replace
+        edits.update(l + r[1] + r[0] + r[2:] for l, r in splits if len(r) > 1)  # Swap
+        return frozenset(edits)
+
+    # Mutate a single bytearray in place and snapshot each candidate instead of concatenating slices
+    word_bytes = word.encode()
+    length = len(word_bytes)
+    edits = set()
+    add = edits.add
+
+    # Replace
+    buf = bytearray(word_bytes)
+    for i in range(length):
+        original = buf[i]
+        for c in LETTER_BYTES:
+            buf[i] = c
+            add(buf.decode())
+        buf[i] = original
+
+    # Insert: a free slot slides from the front of the word to the back
+    buf = bytearray(b"a" + word_bytes)
+    for i in range(length + 1):
+        for c in LETTER_BYTES:
+            buf[i] = c
+            add(buf.decode())
+        if i < length:
+            buf[i] = word_bytes[i]
+
+    # Delete
+    for i in range(length):
+        add((word_bytes[:i] + word_bytes[i + 1:]).decode())
+
+    # Swap
+    buf = bytearray(word_bytes)
+    for i in range(length - 1):
+        buf[i], buf[i + 1] = buf[i + 1], buf[i]
+        add(buf.decode())
+        buf[i], buf[i + 1] = buf[i + 1], buf[i]
+
+    return frozenset(edits)
+
+
+def pack_words(words):
+    # Zero-padded code point matrix (one row per word) and the word lengths, as the kernels below expect
+    count = len(words)
+    width = max(max(map(len, words)), 1)
+    chars = np.array(words, dtype=f"<U{width}").view(np.uint32).reshape(count, width)
+    lens = np.fromiter(map(len, words), dtype=np.int64, count=count)
+    return chars, lens
+
+
+def build_peq(orig_chars, orig_len):
+    # Myers' Peq table: for every ASCII character, a bit mask of its positions in the original word
+    peq = np.zeros(128, dtype=np.uint64)
+    for j in range(min(orig_len, 64)):
+        c = orig_chars[j]
+        if c < 128:
+            peq[c] |= np.uint64(1) << np.uint64(j)
+    return peq
+
+
+def levenshtein(cand_chars, k, cand_len, orig_chars, orig_len, peq, prev, curr):
+    # Levenshtein distance between row k of the candidate matrix and the original word.
+    # Bit-parallel (Myers) when the original word fits in one 64-bit word, two rolling DP rows otherwise.
+    if orig_len == 0:
+        return cand_len
+    if orig_len <= 64:
+        one = np.uint64(1)
+        high = one << np.uint64(orig_len - 1)
+        vp = ~np.uint64(0)
+        vn = np.uint64(0)
+        distance = orig_len
+        for i in range(cand_len):
+            c = cand_chars[k, i]
+            if c < 128:
+                eq = peq[c]
+            else:
+                eq = np.uint64(0)
+                for j in range(orig_len):
+                    if orig_chars[j] == c:
+                        eq |= one << np.uint64(j)
+            xv = eq | vn
+            xh = (((eq & vp) + vp) ^ vp) | eq
+            ph = vn | ~(xh | vp)
+            mh = vp & xh
+            if ph & high:
+                distance += 1
+            elif mh & high:
+                distance -= 1
+            ph = (ph << one) | one
+            mh = mh << one
+            vp = mh | ~(xv | ph)
+            vn = ph & xv
+        return distance
+
+    for j in range(orig_len + 1):
+        prev[j] = j
+    for i in range(1, cand_len + 1):
+        curr[0] = i
+        c = cand_chars[k, i - 1]
+        for j in range(1, orig_len + 1):
+            cost = 0 if c == orig_chars[j - 1] else 1
+            curr[j] = min(prev[j] + 1, curr[j - 1] + 1, prev[j - 1] + cost)
+        prev, curr = curr, prev
+    return prev[orig_len]
+
+
+def score_candidates(cand_chars, orig_chars, cand_lens, orig_len, neg_log_probs):
+    # Batch version of combined_score: candidates are rows of a zero-padded code point matrix.
+    # Fuses the Levenshtein distance, the common prefix loop and the custom_score length branches.
+    count = cand_chars.shape[0]
+    scores = np.empty(count, dtype=np.float64)
+    peq = build_peq(orig_chars, orig_len)
+    prev = np.empty(orig_len + 1, dtype=np.int64)
+    curr = np.empty(orig_len + 1, dtype=np.int64)
+    for k in range(count):
+        cand_len = cand_lens[k]
+        distance = levenshtein(cand_chars, k, cand_len, orig_chars, orig_len, peq, prev, curr)
+
+        # Common prefix length
+        common_prefix_len = 0
+        limit = min(cand_len, orig_len)
+        while common_prefix_len < limit and cand_chars[k, common_prefix_len] == orig_chars[common_prefix_len]:
+            common_prefix_len += 1
+
+        # Same weights as custom_score (replace 1, insert 2, delete 3, swap 4)
+        if cand_len == orig_len:
+            edit_score = distance * 1 + (orig_len - common_prefix_len)
+        elif cand_len == orig_len + 1:
+            edit_score = distance * 2 + (orig_len - common_prefix_len)
+        elif cand_len == orig_len - 1:
+            edit_score = distance * 3
+        else:
+            edit_score = distance * 4
+
+        scores[k] = edit_score + neg_log_probs[k]
+    return scores
+
+
+if njit is not None:
+    build_peq = njit(cache=True)(build_peq)
+    levenshtein = njit(cache=True)(levenshtein)
+    score_candidates = njit(cache=True)(score_candidates)
+
+
+# Large NLTK corpora used by the enhanced and hybrid checkers, keyed by the name passed to the worker processes
+LARGE_CORPORA = {"brown": brown, "reuters": reuters}
+
+
+def load_corpus_words(name):
+    # Load the lowercased alphabetic words of a large corpus (runs in a worker process)
+    corpus_words = LARGE_CORPORA[name].words()
+    return [word.lower() for word in corpus_words if word.isalpha()], len(corpus_words)
+
+
+def load_large_corpora():
+    # Load the words of each large corpus, one list per corpus that could be loaded, in LARGE_CORPORA order.
+    # The corpora are independent, so they load in parallel worker processes, or in this process
+    # if the workers can't be started.
+    results = {}
+    try:
+        with ProcessPoolExecutor(max_workers=len(LARGE_CORPORA)) as executor:
+            futures = [(name, executor.submit(load_corpus_words, name)) for name in LARGE_CORPORA]
+            for name, future in futures:
+                try:
+                    results[name] = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    results[name] = e
+    except Exception as e:
+        print(f"Could not start worker processes ({e}), loading the corpora one by one")
+        for name in LARGE_CORPORA:
+            try:
+                results[name] = load_corpus_words(name)
+            except Exception as e:
+                results[name] = e
+
+    corpora = []
+    for name in LARGE_CORPORA:
+        if isinstance(results[name], Exception):
+            print(f"Warning: Could not load {name.title()} corpus: {results[name]}")
+        else:
+            corpus_words, total = results[name]
+            corpora.append(corpus_words)
+            print(f"Loaded {total} words from {name.title()} corpus")
+    return corpora
+
 
 class Autocorrection(object):
 
     def __init__(self, filename):
         with open(filename, "r", encoding="utf-8") as file:
-            word = []
-            lines = file.readlines()
-            for line in lines:
-                word += re.findall(r'\w+', line.lower())
+            word = TOKEN_RE.findall(file.read().lower())
 
         self.vocabulary = set(word)
         self.counts_of_word = Counter(word)
+        # Sorted vocabulary: the words starting with a prefix form one range of it, found by binary search
+        self.sorted_vocabulary = sorted(self.vocabulary)
         self.total_words = float(sum(self.counts_of_word.values()))
         self.prob_of_word = {w: self.counts_of_word[w] / self.total_words for w in self.counts_of_word.keys()}
 
@@ -25,19 +262,61 @@ class Autocorrection(object):
         self.total_bigrams = float(sum(self.counts_of_bigram.values()))
         self.prob_of_bigram = {bg: self.counts_of_bigram[bg] / self.total_bigrams for bg in self.counts_of_bigram.keys()}
 
-    def edit1(self, word):
-        letter = string.ascii_lowercase
-        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
-        insert = [l + c + r for l, r in splits for c in letter]
-        delete = [l + r[1:] for l,r in splits if r]
-        replace = [l + c + r[1:] for l, r in splits if r for c in letter]
-        swap = [l + r[1] + r[0] + r[2:] for l, r in splits if len(r) > 1]
+        # Precompute the negative log probabilities once so scoring never calls log per candidate
+        self.default_neg_log = -math.log(1e-9)
+        self.neg_log_prob = {w: -math.log(p) for w, p in self.prob_of_word.items()}
+        self.neg_log_bigram = {bg: -math.log(p) for bg, p in self.prob_of_bigram.items()}
+
+        # Build the SymSpell-style index: every string reachable by up to two deletes -> vocabulary words
+        self.deletes = {}
+        for w in self.vocabulary:
+            for variant in self.delete_variants(w):
+                self.deletes.setdefault(variant, []).append(w)
+
+    def complete_prefix(self, prefix, limit=None):
+        # The vocabulary words starting with the prefix (the prefix itself included), most frequent first
+        start = bisect.bisect_left(self.sorted_vocabulary, prefix)
+        end = bisect.bisect_left(self.sorted_vocabulary, prefix + chr(sys.maxunicode), start)
+        completions = self.sorted_vocabulary[start:end]
+        if limit is not None:
+            return heapq.nlargest(limit, completions, key=self.counts_of_word.__getitem__)
+        return sorted(completions, key=self.counts_of_word.__getitem__, reverse=True)
+
+    def delete_variants(self, word, max_deletes=2):
+        # All strings reachable from the word by removing up to max_deletes characters (including the word itself)
+        variants = {word}
+        frontier = {word}
+        for _ in range(max_deletes):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            variants |= frontier
+        return variants
+
+    # Shared with the other checkers, see edit1_variants
+    edit1 = staticmethod(edit1_variants)
 
-        return set(replace + insert + delete + swap)
-  
     def edit2(self, word):
         return [e2 for e1 in self.edit1(word) for e2 in self.edit1(e1)]
 
+    # Shared with the hybrid checker, see adjacent_transposition
+    is_transposition = staticmethod(adjacent_transposition)
+
+    def candidates(self, word):
+        # Look up the deletes of the query in the index instead of enumerating every 1- and 2-edit string
+        matches = set()
+        for variant in self.delete_variants(word):
+            matches.update(self.deletes.get(variant, ()))
+
+        # Verify the matches, preferring words one edit (or one swap) away as edit1 did
+        word_bytes = word.encode()
+        within_one, within_two = [], []
+        for w in matches:
+            distance = self.edit_distance(w, word, word_bytes)
+            if distance <= 1 or self.is_transposition(w, word):
+                within_one.append(w)
+            elif distance <= 2:
+                within_two.append(w)
+        return within_one or within_two
+
     def common_prefix_length(self, word1, word2):
         # Calculating the length of the common prefix between two words
         common_len = 0
@@ -48,7 +327,16 @@ class Autocorrection(object):
                 break
         return common_len
 
-    def custom_score(self, suggestion, original_word):
+    def edit_distance(self, suggestion, original_word, original_bytes=None):
+        # Levenshtein distance, using the StringZilla kernel when it is installed.
+        # That kernel counts bytes, which only equal characters when both words are ASCII.
+        if sz_edit_distance is not None and suggestion.isascii() and original_word.isascii():
+            if original_bytes is None:
+                original_bytes = original_word.encode()
+            return sz_edit_distance(suggestion.encode(), original_bytes)
+        return editdistance.eval(suggestion, original_word)
+
+    def custom_score(self, suggestion, original_word, original_bytes=None):
         # Assign weights to different edit operations (replace, insert, delete, swap)
         replace_weight = 1
         insert_weight = 2
@@ -56,7 +344,7 @@ class Autocorrection(object):
         swap_weight = 4
 
         # Calculate the edit distance for each suggestion
-        distance = editdistance.eval(suggestion, original_word)
+        distance = self.edit_distance(suggestion, original_word, original_bytes)
 
         # Calculating a custom score based on the edit distance and the edit operation
         if len(suggestion) == len(original_word):  # Replace
@@ -74,48 +362,70 @@ class Autocorrection(object):
     
 
 
-    def combined_score(self, suggestion, original_word):
-        edit_score = self.custom_score(suggestion, original_word)
-        prob_score = -np.log(self.prob_of_word.get(suggestion, 1e-9))  # Avoid log(0)
+    def combined_score(self, suggestion, original_word, original_bytes=None):
+        edit_score = self.custom_score(suggestion, original_word, original_bytes)
+        prob_score = self.neg_log_prob.get(suggestion, self.default_neg_log)  # Avoid log(0)
         return edit_score + prob_score
 
-    
-  
-    def correct_spelling(self, word):
+    def rank_candidates(self, best_guesses, word, previous_word=None, limit=None):
+        # Score every candidate at once from the precomputed negative log probabilities
+        # With previous_word set, this matches the context score (unigram counted twice + 10x bigram)
+        # With a limit, only the best `limit` candidates are returned
+        count = len(best_guesses)
+        default = self.default_neg_log
+        neg_log_probs = np.fromiter((self.neg_log_prob.get(w, default) for w in best_guesses), dtype=np.float64, count=count)
+
+        if njit is not None:
+            # Pack the candidates into a padded code point matrix and score them in one kernel call
+            cand_chars, cand_lens = pack_words(best_guesses)
+            orig_chars = pack_words([word])[0][0]
+            scores = score_candidates(cand_chars, orig_chars, cand_lens, len(word), neg_log_probs)
+        else:
+            word_bytes = word.encode()
+            edit_scores = np.fromiter((self.custom_score(w, word, word_bytes) for w in best_guesses), dtype=np.float64, count=count)
+            scores = edit_scores + neg_log_probs
+
+        if previous_word is not None:
+            scores += neg_log_probs
+            if previous_word:
+                neg_log_bigrams = np.fromiter((self.neg_log_bigram.get((previous_word, w), default) for w in best_guesses), dtype=np.float64, count=count)
+                scores += 10 * neg_log_bigrams
+
+        if limit is not None and count > limit:
+            # Partial sort: keep every score up to the limit-th smallest, then order just those.
+            # Ties stay in input order, so the result is the same prefix the full stable sort gives.
+            kth = np.partition(scores, limit - 1)[limit - 1]
+            top = np.flatnonzero(scores <= kth)
+            return [best_guesses[i] for i in top[np.argsort(scores[top], kind="stable")][:limit]]
+        return [best_guesses[i] for i in np.argsort(scores, kind="stable")]
+
+    def correct_spelling(self, word, limit=None):
         if word in self.vocabulary:
             print(f"{word} is already correctly spelt")
             return
 
-        ## suggestions = self.edit1(word) or self.edit2(word) or [word]
-        suggestions = self.edit1(word).union(self.edit2(word))
-        best_guesses = [w for w in suggestions if w in self.vocabulary]
+        best_guesses = self.candidates(word)
         if not best_guesses:
             return[(word,0,0)]
 
         # Sorting the best guesses based on custom scoring
-        best_guesses.sort(key=lambda w: self.combined_score(w, word))
+        best_guesses = self.rank_candidates(best_guesses, word, limit=limit)
 
         return [(w, self.prob_of_word[w]) for w in best_guesses]
         
-    def correct_spelling_with_context(self, previous_word, word):
+    def correct_spelling_with_context(self, previous_word, word, limit=None):
         """
         Suggest corrections for 'word' using the previous word as context (bigram probability).
+        With a limit, only the best `limit` corrections are returned.
         """
         if word in self.vocabulary:
             return [(word, self.prob_of_word[word], self.prob_of_bigram.get((previous_word, word), 0))]
 
-        suggestions = self.edit1(word).union(self.edit2(word))
-        best_guesses = [w for w in suggestions if w in self.vocabulary]
+        best_guesses = self.candidates(word)
         if not best_guesses:
             return [(word, 0, 0)]
 
         # Sort by combined score: edit distance + unigram prob + bigram prob (if available)
-        def context_score(w):
-            edit_score = self.combined_score(w, word)
-            unigram_score = -np.log(self.prob_of_word.get(w, 1e-9))
-            bigram_score = -np.log(self.prob_of_bigram.get((previous_word, w), 1e-9)) if previous_word else 0
-            return edit_score + unigram_score + 10*bigram_score
-
-        best_guesses.sort(key=context_score)
+        best_guesses = self.rank_candidates(best_guesses, word, previous_word, limit)
         return [(w, self.prob_of_word[w], self.prob_of_bigram.get((previous_word, w), 0)) for w in best_guesses]
         
\ No newline at end of file
@@ -1,26 +1,152 @@
-import string
 import re
+import math
 from collections import Counter
 import editdistance
 import numpy as np
 import nltk
-from nltk.corpus import brown, reuters
 import json
 import os
+import time
+import atexit
+import tempfile
+import threading
+from itertools import chain, islice
 # Add SymSpellPy import
 from symspellpy.symspellpy import SymSpell, Verbosity
 from nltk.corpus import wordnet
+from .autocorrection import edit1_variants, load_large_corpora, pack_words, score_candidates
+
+# With Numba, score_candidates is a compiled batch kernel; otherwise candidates are scored one by one
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Tokenizer for the original corpus file, compiled once at import time
+TOKEN_RE = re.compile(r'\w+')
+
+# StringZilla provides a SIMD Levenshtein kernel for ASCII words; fall back to editdistance if it isn't installed
+try:
+    from stringzilla import edit_distance as sz_edit_distance
+except ImportError:
+    sz_edit_distance = None
+
+# marisa-trie stores the corpus vocabulary far more compactly than a set/dict of Python strings
+try:
+    import marisa_trie
+except ImportError:
+    marisa_trie = None
+
+
+# orjson serializes the custom words/shortcuts files much faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Minimum number of seconds between user-feedback saves; pending feedback is flushed at exit
+FEEDBACK_SAVE_INTERVAL = 5.0
+
+# Per-user cache of the WordNet synonym index; it is rebuilt when the version or the WordNet data changes
+SYNONYM_INDEX_FILE = os.path.expanduser("~/.autocorrect_synonym_index.json")
+SYNONYM_INDEX_VERSION = 2
+
+
+def read_json(path):
+    """Load a JSON file, using orjson when it is installed."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def write_json(path, data):
+    """Save data as indented JSON, using orjson when it is installed."""
+    # Write a temporary file next to the target and move it into place, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        if orjson is not None:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class TrieVocabulary(object):
+    """
+    Set-like vocabulary backed by a marisa-trie of corpus word counts and
+    their negative log probabilities, with small overlay sets for words
+    added or removed at runtime.
+    """
+
+    def __init__(self, counts, total):
+        self.trie = marisa_trie.RecordTrie("<If", ((w, (c, -math.log(c / total))) for w, c in counts.items()))
+        self.added = set()
+        self.removed = set()
+
+    def __contains__(self, word):
+        if word in self.added:
+            return True
+        return word in self.trie and word not in self.removed
+
+    def __len__(self):
+        return len(self.trie) + len(self.added) - len(self.removed)
+
+    def __iter__(self):
+        for word in self.trie.iterkeys():
+            if word not in self.removed:
+                yield word
+        yield from self.added
+
+    def count(self, word):
+        """Get the corpus count of a word, or 0 if it is unknown."""
+        if word in self.removed or word not in self.trie:
+            return 0
+        return self.trie[word][0][0]
+
+    def neg_log_prob(self, word):
+        """Get the precomputed negative log probability of a word, or None if it is unknown."""
+        if word in self.removed or word not in self.trie:
+            return None
+        return self.trie[word][0][1]
+
+    def add(self, word):
+        if word in self.trie:
+            self.removed.discard(word)
+        else:
+            self.added.add(word)
+
+    def update(self, words):
+        for word in words:
+            self.add(word)
+
+    def discard(self, word):
+        if word in self.trie:
+            self.removed.add(word)
+        else:
+            self.added.discard(word)
+
 
 class EnhancedAutocorrection(object):
     """
     Enhanced autocorrection system using multiple large corpora and n-gram models.
     """
 
-    def __init__(self, original_corpus_file="autocorrect_package/corpus2.txt", use_large_corpora=True):
+    def __init__(self, original_corpus_file="autocorrect_package/corpus2.txt", use_large_corpora=True, precompute_synonyms=True):
         self.use_large_corpora = use_large_corpora
         self.custom_words = set()
         self.shortcuts = {}  # Dictionary to store shortcuts: {"bcz": "because", "mrn": "morning"}
+        self.shortcuts_trie = None  # Prefix index over the shortcut keys (marisa-trie only)
         self.user_feedback = {}  # Track user corrections for learning
+        self.feedback_dirty = False  # Feedback recorded since the last save
+        # Guards custom_words, user_feedback and their file: feedback can be recorded from a background thread
+        self.custom_words_lock = threading.RLock()
+        self.last_feedback_save = time.monotonic()
+        atexit.register(self.flush_user_feedback)
         # SymSpellPy initialization
         self.sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
         dict_path = os.path.join(os.path.dirname(__file__), "frequency_dictionary_en_82_765.txt")
@@ -30,98 +156,91 @@ class EnhancedAutocorrection(object):
             print(f"Warning: SymSpell frequency dictionary not found at {dict_path}")
         # Load original corpus
         self.original_words = self.load_original_corpus(original_corpus_file)
+        corpora = [self.original_words]
         
         # Load large corpora if enabled
         if use_large_corpora:
-            self.large_corpus_words = self.load_large_corpora()
-            # Combine all words
-            all_words = self.original_words + self.large_corpus_words
-        else:
-            all_words = self.original_words
+            corpora.extend(self.load_large_corpora())
         
         # Build vocabulary and statistics
-        self.build_vocabulary(all_words)
+        self.build_vocabulary(corpora)
         
         # Load custom words and shortcuts if they exist
         self.load_custom_words()
         self.load_shortcuts()
         
+        # Prebuilt WordNet synonyms, so get_synonyms doesn't hit the WordNet reader on every query.
+        # Building the index takes a pass over all of WordNet, so that runs in the background;
+        # until it is done, get_synonyms queries WordNet directly.
+        self.synonym_index = {}
+        # NLTK's lazy corpus loader must not be triggered from two threads at once
+        self.wordnet_load_lock = threading.Lock()
+        if precompute_synonyms:
+            threading.Thread(target=self.load_synonym_index, daemon=True).start()
+        
         print(f"Enhanced Autocorrection initialized with {len(self.vocabulary)} unique words and {len(self.shortcuts)} shortcuts")
 
     def load_original_corpus(self, filename):
         """Load words from the original corpus file."""
         try:
             with open(filename, "r", encoding="utf-8") as file:
-                words = []
-                lines = file.readlines()
-                for line in lines:
-                    words += re.findall(r'\w+', line.lower())
-            return words
+                return TOKEN_RE.findall(file.read().lower())
         except FileNotFoundError:
             print(f"Warning: {filename} not found, using only large corpora")
             return []
 
     def load_large_corpora(self):
-        """Load words from Brown and Reuters corpora."""
-        words = []
-        
-        try:
-            # Load Brown corpus (1M+ words from various domains)
-            print("Loading Brown corpus...")
-            brown_words = brown.words()
-            words.extend([word.lower() for word in brown_words if word.isalpha()])
-            print(f"Loaded {len(brown_words)} words from Brown corpus")
-            
-        except Exception as e:
-            print(f"Warning: Could not load Brown corpus: {e}")
-        
-        try:
-            # Load Reuters corpus (news articles)
-            print("Loading Reuters corpus...")
-            reuters_words = reuters.words()
-            words.extend([word.lower() for word in reuters_words if word.isalpha()])
-            print(f"Loaded {len(reuters_words)} words from Reuters corpus")
-            
-        except Exception as e:
-            print(f"Warning: Could not load Reuters corpus: {e}")
-        
-        return words
-
-    def build_vocabulary(self, all_words):
-        """Build vocabulary, word counts, and n-gram models."""
+        """Load words from Brown and Reuters corpora, one token list per corpus."""
+        # Brown (1M+ words from various domains) and Reuters (news articles)
+        print("Loading Brown and Reuters corpora...")
+        return load_large_corpora()
+
+    def build_vocabulary(self, corpora):
+        """Build vocabulary, word counts, and n-gram models from a list of token sequences."""
+        # The corpora are streamed back to back instead of being concatenated into one big list
         # Basic vocabulary and word counts
-        self.vocabulary = set(all_words)
-        self.counts_of_word = Counter(all_words)
-        self.total_words = float(sum(self.counts_of_word.values()))
-        self.prob_of_word = {w: self.counts_of_word[w] / self.total_words for w in self.counts_of_word.keys()}
+        counts_of_word = Counter(chain.from_iterable(corpora))
+        self.total_words = float(sum(counts_of_word.values()))
+        self.default_neg_log = -math.log(1e-9)
+        if marisa_trie is not None:
+            # Keep the counts in the trie; prob_of_word/neg_log_prob only hold custom-word overrides
+            self.vocabulary = TrieVocabulary(counts_of_word, self.total_words)
+            self.prob_of_word = {}
+            self.neg_log_prob = {}
+        else:
+            self.vocabulary = set(counts_of_word)
+            self.prob_of_word = {w: c / self.total_words for w, c in counts_of_word.items()}
+            self.neg_log_prob = {w: -math.log(p) for w, p in self.prob_of_word.items()}
         
         # Add custom words to vocabulary
         self.vocabulary.update(self.custom_words)
         
+        # Group the vocabulary by word length so edit-distance scans can skip impossible lengths
+        self.vocab_by_len = {}
+        for word in set(counts_of_word).union(self.custom_words):
+            self.vocab_by_len.setdefault(len(word), []).append(word)
+        
         # Build bigram (2-gram) model
         print("Building bigram model...")
-        self.bigrams = list(nltk.bigrams(all_words))
-        self.counts_of_bigram = Counter(self.bigrams)
+        self.counts_of_bigram = Counter(nltk.bigrams(chain.from_iterable(corpora)))
         self.total_bigrams = float(sum(self.counts_of_bigram.values()))
-        self.prob_of_bigram = {bg: self.counts_of_bigram[bg] / self.total_bigrams for bg in self.counts_of_bigram.keys()}
+        self.log_total_bigrams = math.log(self.total_bigrams) if self.total_bigrams else 0.0
         
         # Build trigram (3-gram) model for better context
         print("Building trigram model...")
-        self.trigrams = list(nltk.trigrams(all_words))
-        self.counts_of_trigram = Counter(self.trigrams)
+        self.counts_of_trigram = Counter(nltk.trigrams(chain.from_iterable(corpora)))
         self.total_trigrams = float(sum(self.counts_of_trigram.values()))
-        self.prob_of_trigram = {tg: self.counts_of_trigram[tg] / self.total_trigrams for tg in self.counts_of_trigram.keys()}
+        self.log_total_trigrams = math.log(self.total_trigrams) if self.total_trigrams else 0.0
         
-        print(f"Built models with {len(self.bigrams)} bigrams and {len(self.trigrams)} trigrams")
+        print(f"Built models with {int(self.total_bigrams)} bigrams and {int(self.total_trigrams)} trigrams")
 
     def load_custom_words(self):
         """Load custom words from file if it exists."""
         try:
             if os.path.exists('custom_words.json'):
-                with open('custom_words.json', 'r') as f:
-                    data = json.load(f)
-                    self.custom_words = set(data.get('words', []))
-                    self.user_feedback = data.get('feedback', {})
+                data = read_json('custom_words.json')
+                self.custom_words = set(data.get('words', []))
+                self.user_feedback = data.get('feedback', {})
                 print(f"Loaded {len(self.custom_words)} custom words")
         except Exception as e:
             print(f"Could not load custom words: {e}")
@@ -130,42 +249,118 @@ class EnhancedAutocorrection(object):
         """Load shortcuts from file if it exists."""
         try:
             if os.path.exists('shortcuts.json'):
-                with open('shortcuts.json', 'r') as f:
-                    self.shortcuts = json.load(f)
+                self.shortcuts = read_json('shortcuts.json')
                 print(f"Loaded {len(self.shortcuts)} shortcuts")
         except Exception as e:
             print(f"Could not load shortcuts: {e}")
+        self.rebuild_shortcuts_trie()
+
+    def rebuild_shortcuts_trie(self):
+        """Rebuild the prefix index over the shortcut keys."""
+        if marisa_trie is not None:
+            self.shortcuts_trie = marisa_trie.BytesTrie((k, v.encode()) for k, v in self.shortcuts.items())
 
     def save_custom_words(self):
         """Save custom words and user feedback to file."""
-        try:
-            data = {
-                'words': list(self.custom_words),
-                'feedback': self.user_feedback
-            }
-            with open('custom_words.json', 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Could not save custom words: {e}")
+        with self.custom_words_lock:
+            try:
+                data = {
+                    'words': list(self.custom_words),
+                    'feedback': self.user_feedback
+                }
+                write_json('custom_words.json', data)
+                self.feedback_dirty = False
+                self.last_feedback_save = time.monotonic()
+            except Exception as e:
+                print(f"Could not save custom words: {e}")
 
     def save_shortcuts(self):
         """Save shortcuts to file."""
+        self.rebuild_shortcuts_trie()
         try:
-            with open('shortcuts.json', 'w') as f:
-                json.dump(self.shortcuts, f, indent=2)
+            write_json('shortcuts.json', self.shortcuts)
         except Exception as e:
             print(f"Could not save shortcuts: {e}")
 
+    def load_synonym_index(self):
+        """Load the synonym index from file, building it from WordNet if it is missing or out of date."""
+        try:
+            with self.wordnet_load_lock:
+                wordnet.ensure_loaded()
+            wordnet_version = wordnet.get_version()
+        except Exception as e:
+            print(f"Could not load WordNet: {e}")
+            return
+        try:
+            if os.path.exists(SYNONYM_INDEX_FILE):
+                data = read_json(SYNONYM_INDEX_FILE)
+                if data.get('version') == SYNONYM_INDEX_VERSION and data.get('wordnet') == wordnet_version:
+                    self.synonym_index = data['synonyms']
+                    print(f"Loaded synonyms for {len(self.synonym_index)} words")
+                    return
+        except Exception as e:
+            print(f"Could not load synonym index: {e}")
+        
+        try:
+            synonym_index = self.build_synonym_index()
+            print(f"Built synonym index for {len(synonym_index)} words")
+        except Exception as e:
+            print(f"Could not build synonym index: {e}")
+            return
+        self.synonym_index = synonym_index
+        try:
+            write_json(SYNONYM_INDEX_FILE, {'version': SYNONYM_INDEX_VERSION, 'wordnet': wordnet_version,
+                                            'synonyms': synonym_index})
+        except Exception as e:
+            print(f"Could not save synonym index: {e}")
+
+    def build_synonym_index(self):
+        """
+        Collect the synonyms of every WordNet lemma in a single pass over the synsets.
+        Like wordnet.synsets, a word also gets the synonyms of its base forms ('saw' those of 'see').
+        """
+        # Lemma names per (lemma, part of speech), in synset order; satellite adjectives count as adjectives
+        by_pos = {}
+        for syn in wordnet.all_synsets():
+            pos = wordnet.ADJ if syn.pos() == wordnet.ADJ_SAT else syn.pos()
+            names = [lemma.name().lower() for lemma in syn.lemmas()]
+            for name in names:
+                by_pos.setdefault((name, pos), {}).update(dict.fromkeys(names))
+        
+        # Merge in the base forms the same way wordnet.synsets does, through its morphy analysis per part of speech
+        index = {}
+        for word in {name for name, _ in by_pos}:
+            names = {}
+            for pos in (wordnet.NOUN, wordnet.VERB, wordnet.ADJ, wordnet.ADV):
+                for form in wordnet._morphy(word, pos):
+                    names.update(by_pos.get((form, pos), {}))
+            word = word.replace('_', ' ')
+            index[word] = [name for name in (name.replace('_', ' ') for name in names) if name != word]
+        return index
+
     def add_custom_word(self, word):
         """Add a custom word to the vocabulary."""
         word = word.lower()
-        self.custom_words.add(word)
+        if word not in self.vocabulary:
+            self.vocab_by_len.setdefault(len(word), []).append(word)
+        with self.custom_words_lock:
+            self.custom_words.add(word)
         self.vocabulary.add(word)
         # Give custom words high probability
         self.prob_of_word[word] = 0.001  # Higher than average
+        self.neg_log_prob[word] = -math.log(0.001)
         self.save_custom_words()
         print(f"Added custom word: {word}")
 
+    def remove_custom_word(self, word):
+        """Remove a custom word from the vocabulary."""
+        with self.custom_words_lock:
+            self.custom_words.discard(word)
+        self.vocabulary.discard(word)
+        self.prob_of_word.pop(word, None)
+        self.neg_log_prob.pop(word, None)
+        self.save_custom_words()
+
     def add_shortcut(self, shortcut, full_word):
         """Add a shortcut mapping."""
         shortcut = shortcut.lower()
@@ -203,35 +398,57 @@ class EnhancedAutocorrection(object):
         """Get all shortcut mappings."""
         return self.shortcuts.copy()
 
+    def autocomplete_shortcut(self, prefix):
+        """Get the (shortcut, full word) pairs whose shortcut starts with the prefix."""
+        prefix = prefix.lower()
+        if self.shortcuts_trie is not None:
+            return sorted((k, v.decode()) for k, v in self.shortcuts_trie.items(prefix))
+        return sorted((k, v) for k, v in self.shortcuts.items() if k.startswith(prefix))
+
     def record_user_feedback(self, original_word, suggested_word, accepted):
         """Record user feedback for learning."""
-        if original_word not in self.user_feedback:
-            self.user_feedback[original_word] = {}
-        
-        if suggested_word not in self.user_feedback[original_word]:
-            self.user_feedback[original_word][suggested_word] = {'accepted': 0, 'rejected': 0}
-        
-        if accepted:
-            self.user_feedback[original_word][suggested_word]['accepted'] += 1
-        else:
-            self.user_feedback[original_word][suggested_word]['rejected'] += 1
-        
-        self.save_custom_words()
+        with self.custom_words_lock:
+            if original_word not in self.user_feedback:
+                self.user_feedback[original_word] = {}
+            
+            if suggested_word not in self.user_feedback[original_word]:
+                self.user_feedback[original_word][suggested_word] = {'accepted': 0, 'rejected': 0}
+            
+            if accepted:
+                self.user_feedback[original_word][suggested_word]['accepted'] += 1
+            else:
+                self.user_feedback[original_word][suggested_word]['rejected'] += 1
+            
+            # Batch the saves: feedback arrives on every correction, so only write every few seconds
+            self.feedback_dirty = True
+            if time.monotonic() - self.last_feedback_save >= FEEDBACK_SAVE_INTERVAL:
+                self.save_custom_words()
+
+    def flush_user_feedback(self):
+        """Save any user feedback recorded since the last save."""
+        if self.feedback_dirty:
+            self.save_custom_words()
 
-    def edit1(self, word):
-        """Generate all possible 1-edit distance variations."""
-        letter = string.ascii_lowercase
-        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
-        insert = [l + c + r for l, r in splits for c in letter]
-        delete = [l + r[1:] for l, r in splits if r]
-        replace = [l + c + r[1:] for l, r in splits if r for c in letter]
-        swap = [l + r[1] + r[0] + r[2:] for l, r in splits if len(r) > 1]
-        return set(replace + insert + delete + swap)
+    # Shared with the other checkers, see edit1_variants
+    edit1 = staticmethod(edit1_variants)
 
     def edit2(self, word):
         """Generate all possible 2-edit distance variations."""
         return [e2 for e1 in self.edit1(word) for e2 in self.edit1(e1)]
 
+    def candidates(self, word):
+        """Find vocabulary words within two edits, checking the 1-edit variations first."""
+        best_guesses = [w for w in self.edit1(word) if w in self.vocabulary]
+        if best_guesses:
+            return best_guesses
+
+        # Only scan the length buckets that can be within two edits of the word
+        word_bytes = word.encode()
+        length = len(word)
+        return [w for n in range(max(length - 2, 1), length + 3)
+                for w in self.vocab_by_len.get(n, ())
+                if self.edit_distance(w, word, word_bytes, bound=3) <= 2 and w in self.vocabulary]
+
     def common_prefix_length(self, word1, word2):
         """Calculate the length of the common prefix between two words."""
         common_len = 0
@@ -242,14 +459,25 @@ class EnhancedAutocorrection(object):
                 break
         return common_len
 
-    def custom_score(self, suggestion, original_word):
+    def edit_distance(self, suggestion, original_word, original_bytes=None, bound=None):
+        """Calculate the Levenshtein distance, using the StringZilla kernel when it is installed."""
+        # The kernel counts bytes, which only equal characters when both words are ASCII
+        if sz_edit_distance is not None and suggestion.isascii() and original_word.isascii():
+            if original_bytes is None:
+                original_bytes = original_word.encode()
+            if bound is None:
+                return sz_edit_distance(suggestion.encode(), original_bytes)
+            return sz_edit_distance(suggestion.encode(), original_bytes, bound)
+        return editdistance.eval(suggestion, original_word)
+
+    def custom_score(self, suggestion, original_word, original_bytes=None):
         """Calculate custom score based on edit distance and operation type."""
         replace_weight = 1
         insert_weight = 2
         delete_weight = 3
         swap_weight = 4
 
-        distance = editdistance.eval(suggestion, original_word)
+        distance = self.edit_distance(suggestion, original_word, original_bytes)
 
         if len(suggestion) == len(original_word):  # Replace
             common_prefix_len = self.common_prefix_length(suggestion, original_word)
@@ -264,49 +492,114 @@ class EnhancedAutocorrection(object):
 
         return score
 
-    def combined_score(self, suggestion, original_word):
+    def word_probability(self, word, default=1e-9):
+        """Get the unigram probability of a word, checking custom-word overrides first."""
+        prob = self.prob_of_word.get(word)
+        if prob is not None:
+            return prob
+        if isinstance(self.vocabulary, TrieVocabulary):
+            count = self.vocabulary.count(word)
+            if count:
+                return count / self.total_words
+        return default
+
+    def word_neg_log_prob(self, word):
+        """Get the precomputed negative log probability of a word, checking custom-word overrides first."""
+        neg_log = self.neg_log_prob.get(word)
+        if neg_log is None and isinstance(self.vocabulary, TrieVocabulary):
+            neg_log = self.vocabulary.neg_log_prob(word)
+        return self.default_neg_log if neg_log is None else neg_log
+
+    def bigram_neg_log_prob(self, bigram):
+        """Get -log P(bigram) from its count: log(total) - log(count)."""
+        count = self.counts_of_bigram.get(bigram)
+        return self.log_total_bigrams - math.log(count) if count else self.default_neg_log
+
+    def trigram_neg_log_prob(self, trigram):
+        """Get -log P(trigram) from its count: log(total) - log(count)."""
+        count = self.counts_of_trigram.get(trigram)
+        return self.log_total_trigrams - math.log(count) if count else self.default_neg_log
+
+    def combined_score(self, suggestion, original_word, original_bytes=None):
         """Calculate combined score using edit distance and word probability."""
-        edit_score = self.custom_score(suggestion, original_word)
-        prob_score = -np.log(self.prob_of_word.get(suggestion, 1e-9))
+        edit_score = self.custom_score(suggestion, original_word, original_bytes)
+        prob_score = self.word_neg_log_prob(suggestion)
         return edit_score + prob_score
 
-    def enhanced_context_score(self, suggestion, original_word, previous_words):
+    def enhanced_context_score(self, suggestion, original_word, previous_words, original_bytes=None):
         """Calculate enhanced context score using n-grams and user feedback."""
         # Base score (edit distance + word probability) - give this more weight
-        base_score = self.combined_score(suggestion, original_word) * 2  # Double the weight
+        base_score = self.combined_score(suggestion, original_word, original_bytes) * 2  # Double the weight
         
         # Context score using bigrams and trigrams - reduce weight
         context_score = 0
         
         if len(previous_words) >= 1:
             # Bigram score
-            bigram_prob = self.prob_of_bigram.get((previous_words[-1], suggestion), 1e-9)
-            context_score += -np.log(bigram_prob) * 0.5  # Reduce bigram weight
+            bigram_score = self.bigram_neg_log_prob((previous_words[-1], suggestion))
+            context_score += bigram_score * 0.5  # Reduce bigram weight
         
         if len(previous_words) >= 2:
             # Trigram score
-            trigram_prob = self.prob_of_trigram.get((previous_words[-2], previous_words[-1], suggestion), 1e-9)
-            context_score += -np.log(trigram_prob) * 1.0  # Reduce trigram weight
+            trigram_score = self.trigram_neg_log_prob((previous_words[-2], previous_words[-1], suggestion))
+            context_score += trigram_score * 1.0  # Reduce trigram weight
         
+        return base_score + context_score + self.feedback_score(suggestion, original_word)
+
+    def feedback_score(self, suggestion, original_word):
+        """Calculate the user feedback score plus the custom word bonus."""
         # User feedback score
         feedback_score = 0
         if original_word in self.user_feedback and suggestion in self.user_feedback[original_word]:
             feedback = self.user_feedback[original_word][suggestion]
-            total = feedback['accepted'] + feedback['rejected']
-            if total > 0:
-                acceptance_rate = feedback['accepted'] / total
-                feedback_score = -np.log(1 - acceptance_rate) * 1.5  # Moderate user feedback weight
+            # Laplace-smoothed log odds of acceptance, negated as lower scores rank first.
+            # Always finite, even when every suggestion was accepted.
+            feedback_score = -math.log((feedback['accepted'] + 1) / (feedback['rejected'] + 1)) * 1.5  # Moderate user feedback weight
         
         # Custom word bonus
         custom_bonus = 0
         if suggestion in self.custom_words:
             custom_bonus = -3  # Moderate preference for custom words
         
-        return base_score + context_score + feedback_score + custom_bonus
+        return feedback_score + custom_bonus
+
+    def rank_candidates(self, best_guesses, word, previous_words, limit=None):
+        """
+        Sort candidates by enhanced_context_score, scoring them in one batch when Numba is available.
+        With a limit, only the best `limit` candidates are returned.
+        """
+        if njit is None:
+            word_bytes = word.encode()
+            return sorted(best_guesses, key=lambda w: self.enhanced_context_score(w, word, previous_words, word_bytes))[:limit]
+
+        # Edit score + word probability for every candidate in one compiled kernel call (the combined_score part)
+        count = len(best_guesses)
+        neg_log_probs = np.fromiter(map(self.word_neg_log_prob, best_guesses), dtype=np.float64, count=count)
+        cand_chars, cand_lens = pack_words(best_guesses)
+        orig_chars = pack_words([word])[0][0]
+        scores = score_candidates(cand_chars, orig_chars, cand_lens, len(word), neg_log_probs) * 2
+
+        # Same context weights as enhanced_context_score
+        if len(previous_words) >= 1:
+            previous = previous_words[-1]
+            scores += 0.5 * np.fromiter((self.bigram_neg_log_prob((previous, w)) for w in best_guesses), dtype=np.float64, count=count)
+        if len(previous_words) >= 2:
+            before, previous = previous_words[-2], previous_words[-1]
+            scores += np.fromiter((self.trigram_neg_log_prob((before, previous, w)) for w in best_guesses), dtype=np.float64, count=count)
+        scores += np.fromiter((self.feedback_score(w, word) for w in best_guesses), dtype=np.float64, count=count)
+
+        if limit is not None and count > limit:
+            # Partial sort: keep every score up to the limit-th smallest, then order just those.
+            # Ties stay in input order, so the result is the same prefix the full stable sort gives.
+            kth = np.partition(scores, limit - 1)[limit - 1]
+            top = np.flatnonzero(scores <= kth)
+            return [best_guesses[i] for i in top[np.argsort(scores[top], kind="stable")][:limit]]
+        return [best_guesses[i] for i in np.argsort(scores, kind="stable")]
 
     def correct_spelling_enhanced(self, previous_words, word):
         """
-        SymSpellPy-only spelling correction (ignores custom corpus for suggestions).
+        SymSpellPy spelling correction, falling back to the corpus vocabulary
+        only when SymSpell has no suggestion within two edits.
         Also provides synonyms for the top suggestion.
         """
         # First check if it's a shortcut
@@ -315,26 +608,38 @@ class EnhancedAutocorrection(object):
             return [(shortcut_expansion, 1.0, 1.0, "Shortcut expansion", self.get_synonyms(shortcut_expansion))]
 
         # If word is in SymSpell dictionary, return it as correct
-        if word in self.sym_spell._words:
+        exact_match = self.sym_spell.lookup(word, Verbosity.TOP, max_edit_distance=0)
+        if exact_match and exact_match[0].term == word:
             synonyms = self.get_synonyms(word)
             return [(word, 1.0, 1.0, "SymSpellPy", synonyms)]
 
         # Use SymSpellPy for fast spelling suggestions
         symspell_suggestions = self.sym_spell.lookup(word, Verbosity.CLOSEST, max_edit_distance=2, include_unknown=True)
-        if symspell_suggestions:
-            results = []
-            for i, suggestion in enumerate(symspell_suggestions[:5]):
-                sug_word = suggestion.term
-                prob = suggestion.count  # Use SymSpell frequency count
-                synonyms = self.get_synonyms(sug_word) if i == 0 else []
-                results.append((sug_word, prob, 1.0, "SymSpellPy", synonyms))
-            return results
+        if symspell_suggestions and symspell_suggestions[0].count > 0:
+            # Probability is the SymSpell frequency count
+            return [(s.term, s.count, 1.0, "SymSpellPy", self.get_synonyms(s.term) if i == 0 else [])
+                    for i, s in enumerate(islice(symspell_suggestions, 5))]
+
+        # SymSpell only knows the word as unknown: try the corpus vocabulary (custom words, Brown, Reuters)
+        best_guesses = self.candidates(word)
+        if best_guesses:
+            best_guesses = self.rank_candidates(best_guesses, word, previous_words, limit=5)
+            return [(w, self.word_probability(w), self.get_context_probability(w, previous_words), "Corpus",
+                     self.get_synonyms(w) if i == 0 else [])
+                    for i, w in enumerate(best_guesses)]
 
         # If no suggestions found, return the original word
         return [(word, 0, 0, "No suggestion", [])]
 
     def get_synonyms(self, word, max_synonyms=5):
         """Get synonyms for a word using WordNet."""
+        # Inflected forms that aren't lemma names themselves, and any word while the index is still being
+        # built, go through WordNet
+        synonyms = self.synonym_index.get(word.lower())
+        if synonyms is not None:
+            return synonyms[:max_synonyms]
+        with self.wordnet_load_lock:
+            wordnet.ensure_loaded()
         synonyms = set()
         for syn in wordnet.synsets(word):
             for lemma in syn.lemmas():
@@ -347,13 +652,14 @@ class EnhancedAutocorrection(object):
         """Get the context probability for a word given previous words."""
         if len(previous_words) >= 2:
             # Try trigram first
-            trigram_prob = self.prob_of_trigram.get((previous_words[-2], previous_words[-1], word), 0)
-            if trigram_prob > 0:
-                return trigram_prob
+            trigram_count = self.counts_of_trigram.get((previous_words[-2], previous_words[-1], word), 0)
+            if trigram_count > 0:
+                return trigram_count / self.total_trigrams
         
         if len(previous_words) >= 1:
             # Fall back to bigram
-            return self.prob_of_bigram.get((previous_words[-1], word), 0)
+            bigram_count = self.counts_of_bigram.get((previous_words[-1], word), 0)
+            return bigram_count / self.total_bigrams if bigram_count else 0
         
         return 0
 
@@ -361,8 +667,8 @@ class EnhancedAutocorrection(object):
         """Get statistics about the corpus."""
         return {
             'total_words': len(self.vocabulary),
-            'total_bigrams': len(self.bigrams),
-            'total_trigrams': len(self.trigrams),
+            'total_bigrams': int(self.total_bigrams),
+            'total_trigrams': int(self.total_trigrams),
             'custom_words': len(self.custom_words),
             'shortcuts': len(self.shortcuts),
             'user_feedback_entries': len(self.user_feedback)
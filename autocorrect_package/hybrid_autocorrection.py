@@ -1,35 +1,108 @@
-import string
 import re
+import math
 from collections import Counter
+from functools import lru_cache
 import editdistance
 import numpy as np
 import nltk
-from nltk.corpus import brown, reuters
 import json
 import os
+from .autocorrection import LARGE_CORPORA, adjacent_transposition, edit1_variants, load_large_corpora, pack_words, score_candidates
+
+# With Numba, score_candidates is a compiled batch kernel; otherwise candidates are scored one by one
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Tokenizer for the original corpus file, compiled once at import time
+TOKEN_RE = re.compile(r'\w+')
+
+# The arrays and totals build_vocabulary produces, saved to and restored from the vocabulary cache as they are;
+# the vocabulary, word2id and delete_index are stored as flat arrays next to them
+VOCABULARY_CACHE_ARRAYS = (
+    'word_counts', 'prob_of_word', 'neg_log_prob',
+    'bigram_keys', 'bigram_counts', 'neg_log_bigram',
+    'trigram_keys', 'trigram_counts', 'neg_log_trigram',
+)
+VOCABULARY_CACHE_TOTALS = ('total_words', 'total_bigrams', 'total_trigrams')
+
+# Bumped whenever the layout of the vocabulary cache changes
+VOCABULARY_CACHE_VERSION = 2
+
+# Per-user vocabulary cache, outside any working directory
+VOCABULARY_CACHE_FILE = os.path.expanduser("~/.autocorrect_hybrid_vocabulary_cache.npz")
+
+# Add-k pseudo-count used to smooth the bigram and trigram probabilities
+NGRAM_ADD_K = 0.5
+
+
+# Common homophones and context-dependent words that get context-aware correction
+CONTEXT_WORDS = frozenset({
+    'there', 'their', "they're",
+    'your', "you're",
+    'its', "it's",
+    'to', 'too', 'two',
+    'where', 'wear', 'were',
+    'here', 'hear',
+    'right', 'write',
+    'know', 'no',
+    'new', 'knew'
+})
+
+
+def pack_strings(strings):
+    # Newline-joined UTF-8 bytes, so the cache holds only plain arrays and loads without unpickling objects
+    return np.frombuffer("\n".join(strings).encode(), dtype=np.uint8)
+
+
+def unpack_strings(packed, count):
+    # The inverse of pack_strings, for a list of count strings (which may include the empty string)
+    return packed.tobytes().decode().split("\n") if count else []
+
+
+def pack_bigrams(first_ids, second_ids):
+    # Pack two word ids into one uint64 key: (first << 32) | second
+    return (np.asarray(first_ids, dtype=np.uint64) << np.uint64(32)) | np.asarray(second_ids, dtype=np.uint64)
+
+
+def pack_trigrams(first_ids, second_ids, third_ids):
+    # Pack three word ids into one uint64 key, 21 bits each (enough for vocabularies of ~2M words)
+    return ((np.asarray(first_ids, dtype=np.uint64) << np.uint64(42))
+            | (np.asarray(second_ids, dtype=np.uint64) << np.uint64(21))
+            | np.asarray(third_ids, dtype=np.uint64))
+
 
 class HybridAutocorrection(object):
     """
     Hybrid autocorrection system that intelligently combines original and enhanced approaches.
     """
 
-    def __init__(self, original_corpus_file="autocorrect_package/corpus2.txt", use_large_corpora=True):
+    def __init__(self, original_corpus_file="autocorrect_package/corpus2.txt", use_large_corpora=True,
+                 cache_file=VOCABULARY_CACHE_FILE):
         self.use_large_corpora = use_large_corpora
         self.custom_words = set()
         self.user_feedback = {}
+        # Per-instance memo of corrections keyed by (last two context words, word); cleared when the model changes
+        self.correct_spelling_cached = lru_cache(maxsize=4096)(self.correct_spelling_uncached)
         
-        # Load original corpus
-        self.original_words = self.load_original_corpus(original_corpus_file)
-        
-        # Load large corpora if enabled
-        if use_large_corpora:
-            self.large_corpus_words = self.load_large_corpora()
-            all_words = self.original_words + self.large_corpus_words
-        else:
-            all_words = self.original_words
-        
-        # Build vocabulary and statistics
-        self.build_vocabulary(all_words)
+        # Reuse the vocabulary built by an earlier run from the same inputs, if there is one
+        cache_key = self.vocabulary_cache_key(original_corpus_file)
+        if not (cache_file and self.load_vocabulary_cache(cache_file, cache_key)):
+            # Load original corpus
+            self.original_words = self.load_original_corpus(original_corpus_file)
+            
+            # Load large corpora if enabled
+            if use_large_corpora:
+                self.large_corpus_words = self.load_large_corpora()
+                all_words = self.original_words + self.large_corpus_words
+            else:
+                all_words = self.original_words
+            
+            # Build vocabulary and statistics
+            self.build_vocabulary(all_words)
+            if cache_file:
+                self.save_vocabulary_cache(cache_file, cache_key)
         
         # Load custom words if they exist
         self.load_custom_words()
@@ -40,65 +113,158 @@ class HybridAutocorrection(object):
         """Load words from the original corpus file."""
         try:
             with open(filename, "r", encoding="utf-8") as file:
-                words = []
-                lines = file.readlines()
-                for line in lines:
-                    words += re.findall(r'\w+', line.lower())
-            return words
+                return TOKEN_RE.findall(file.read().lower())
         except FileNotFoundError:
             print(f"Warning: {filename} not found, using only large corpora")
             return []
 
     def load_large_corpora(self):
         """Load words from Brown and Reuters corpora."""
-        words = []
-        
-        try:
-            print("Loading Brown corpus...")
-            brown_words = brown.words()
-            words.extend([word.lower() for word in brown_words if word.isalpha()])
-            print(f"Loaded {len(brown_words)} words from Brown corpus")
-            
-        except Exception as e:
-            print(f"Warning: Could not load Brown corpus: {e}")
-        
-        try:
-            print("Loading Reuters corpus...")
-            reuters_words = reuters.words()
-            words.extend([word.lower() for word in reuters_words if word.isalpha()])
-            print(f"Loaded {len(reuters_words)} words from Reuters corpus")
-            
-        except Exception as e:
-            print(f"Warning: Could not load Reuters corpus: {e}")
-        
-        return words
+        # The corpora are concatenated in order
+        print("Loading Brown and Reuters corpora...")
+        return [word for corpus_words in load_large_corpora() for word in corpus_words]
 
     def build_vocabulary(self, all_words):
         """Build vocabulary, word counts, and n-gram models."""
         # Basic vocabulary and word counts
         self.vocabulary = set(all_words)
-        self.counts_of_word = Counter(all_words)
-        self.total_words = float(sum(self.counts_of_word.values()))
-        self.prob_of_word = {w: self.counts_of_word[w] / self.total_words for w in self.counts_of_word.keys()}
+        counts_of_word = Counter(all_words)
+        
+        # Word ids index parallel count and probability arrays; id 0 is the out-of-vocabulary sentinel (1e-9)
+        self.word2id = {w: i for i, w in enumerate(counts_of_word, start=1)}
+        self.word_counts = np.zeros(len(counts_of_word) + 1, dtype=np.int64)
+        self.word_counts[1:] = np.fromiter(counts_of_word.values(), dtype=np.int64, count=len(counts_of_word))
+        self.total_words = float(self.word_counts.sum())
+        self.prob_of_word = self.word_counts / self.total_words
+        self.prob_of_word[0] = 1e-9
+        self.neg_log_prob = -np.log(self.prob_of_word)
         
         # Add custom words to vocabulary
         self.vocabulary.update(self.custom_words)
         
+        # SymSpell-style delete index: every string reachable by up to two deletes -> vocabulary words
+        self.delete_index = {}
+        for word in self.vocabulary:
+            self.add_to_delete_index(word)
+        
         # Build bigram model
         print("Building bigram model...")
-        self.bigrams = list(nltk.bigrams(all_words))
-        self.counts_of_bigram = Counter(self.bigrams)
-        self.total_bigrams = float(sum(self.counts_of_bigram.values()))
-        self.prob_of_bigram = {bg: self.counts_of_bigram[bg] / self.total_bigrams for bg in self.counts_of_bigram.keys()}
+        counts_of_bigram = Counter(zip(all_words, all_words[1:]))
+        self.total_bigrams = float(sum(counts_of_bigram.values()))
+        self.bigram_keys, self.bigram_counts, self.neg_log_bigram = self.build_ngram_table(
+            counts_of_bigram, 2, pack_bigrams, self.total_bigrams)
         
         # Build trigram model
         print("Building trigram model...")
-        self.trigrams = list(nltk.trigrams(all_words))
-        self.counts_of_trigram = Counter(self.trigrams)
-        self.total_trigrams = float(sum(self.counts_of_trigram.values()))
-        self.prob_of_trigram = {tg: self.counts_of_trigram[tg] / self.total_trigrams for tg in self.counts_of_trigram.keys()}
+        counts_of_trigram = Counter(zip(all_words, all_words[1:], all_words[2:]))
+        self.total_trigrams = float(sum(counts_of_trigram.values()))
+        self.trigram_keys, self.trigram_counts, self.neg_log_trigram = self.build_ngram_table(
+            counts_of_trigram, 3, pack_trigrams, self.total_trigrams)
         
-        print(f"Built models with {len(self.bigrams)} bigrams and {len(self.trigrams)} trigrams")
+        print(f"Built models with {int(self.total_bigrams)} bigrams and {int(self.total_trigrams)} trigrams")
+
+    def build_ngram_table(self, counts_of_ngram, n, pack, total):
+        """
+        Turn an n-gram Counter into sorted packed uint64 keys with aligned counts and add-k smoothed -log probabilities.
+        The count and -log arrays get one extra trailing slot for unseen n-grams, which position -1 selects;
+        see ngram_neg_log for how unseen n-grams back off to the unigram model.
+        """
+        size = len(counts_of_ngram)
+        word2id = self.word2id
+        ids = [np.fromiter((word2id[ngram[i]] for ngram in counts_of_ngram), dtype=np.uint64, count=size) for i in range(n)]
+        keys = pack(*ids)
+        order = np.argsort(keys)
+        counts = np.fromiter(counts_of_ngram.values(), dtype=np.float64, count=size)[order]
+        # Add-k over the seen n-grams plus one shared unseen slot, so unseen n-grams get a finite
+        # corpus-dependent -log probability instead of the 1e-9 sentinel. The unseen slot's mass is
+        # spread over words by their unigram probability, so all slots together sum to one.
+        smoothed_total = total + NGRAM_ADD_K * (size + 1)
+        neg_logs = -np.log((counts + NGRAM_ADD_K) / smoothed_total)
+        return keys[order], np.append(counts, 0.0), np.append(neg_logs, -math.log(NGRAM_ADD_K / smoothed_total))
+
+    def ngram_positions(self, table_keys, keys):
+        """Find packed n-gram keys in a sorted key table, with -1 where the n-gram was never seen."""
+        if not len(table_keys):
+            return np.full(np.shape(keys), -1)
+        positions = np.minimum(np.searchsorted(table_keys, keys), len(table_keys) - 1)
+        return np.where(table_keys[positions] == keys, positions, -1)
+
+    def ngram_neg_log(self, table_keys, neg_log_table, keys, word_ids):
+        """
+        Look up the smoothed -log probabilities of packed n-grams ending in the given word ids.
+        Unseen n-grams back off to the unigram model: the unseen slot's share times the word's probability.
+        """
+        positions = self.ngram_positions(table_keys, keys)
+        return neg_log_table[positions] + np.where(positions < 0, self.neg_log_prob[word_ids], 0.0)
+
+    def vocabulary_cache_key(self, original_corpus_file):
+        """Identify the inputs the vocabulary is built from, so a stale cache is never reused."""
+        try:
+            stat = os.stat(original_corpus_file)
+            corpus = (os.path.abspath(original_corpus_file), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            corpus = None
+        large_corpora = None
+        if self.use_large_corpora:
+            # The NLTK version and where (and when) each corpus was installed
+            large_corpora = [nltk.__version__]
+            for name, corpus_reader in LARGE_CORPORA.items():
+                try:
+                    root = str(corpus_reader.root)
+                    large_corpora.append((name, root, os.stat(root).st_mtime_ns))
+                except (LookupError, OSError):
+                    large_corpora.append((name, None))
+        return repr((VOCABULARY_CACHE_VERSION, NGRAM_ADD_K, corpus, self.use_large_corpora, large_corpora))
+
+    def load_vocabulary_cache(self, cache_file, cache_key):
+        """Restore the built vocabulary and n-gram models from the cache file if its key matches."""
+        try:
+            if not os.path.exists(cache_file):
+                return False
+            # Plain arrays only: allow_pickle=False never runs code from the file
+            with np.load(cache_file, allow_pickle=False) as data:
+                if str(data['key']) != cache_key:
+                    return False
+                for name in VOCABULARY_CACHE_ARRAYS:
+                    setattr(self, name, data[name])
+                for name in VOCABULARY_CACHE_TOTALS:
+                    setattr(self, name, float(data[name]))
+                # Words are stored in id order; id 0 is the out-of-vocabulary sentinel
+                words = unpack_strings(data['words'], len(self.word_counts) - 1)
+                # Each delete key's words are one run of delete_ids, delete_lengths long
+                ends = np.cumsum(data['delete_lengths'])
+                starts = (ends - data['delete_lengths']).tolist()
+                delete_keys = unpack_strings(data['delete_keys'], len(ends))
+                delete_words = [words[i - 1] for i in data['delete_ids'].tolist()]
+            self.vocabulary = set(words)
+            self.word2id = {w: i for i, w in enumerate(words, start=1)}
+            self.delete_index = {key: delete_words[start:end] for key, start, end in zip(delete_keys, starts, ends.tolist())}
+            print(f"Loaded vocabulary cache from {cache_file}")
+            return True
+        except Exception as e:
+            print(f"Could not load vocabulary cache: {e}")
+            return False
+
+    def save_vocabulary_cache(self, cache_file, cache_key):
+        """Save the built vocabulary and n-gram models so the next start can skip building them."""
+        tmp_file = cache_file + ".tmp"
+        try:
+            word2id = self.word2id
+            data = {name: getattr(self, name) for name in VOCABULARY_CACHE_ARRAYS}
+            data.update((name, np.float64(getattr(self, name))) for name in VOCABULARY_CACHE_TOTALS)
+            # word2id was filled in id order, so its keys are the words by id
+            data['words'] = pack_strings(word2id)
+            data['delete_keys'] = pack_strings(self.delete_index)
+            data['delete_lengths'] = np.fromiter(map(len, self.delete_index.values()), dtype=np.int64, count=len(self.delete_index))
+            data['delete_ids'] = np.array([word2id[w] for words in self.delete_index.values() for w in words], dtype=np.int64)
+            # Write next to the cache and move it into place, so a half-written cache is never loaded
+            with open(tmp_file, 'wb') as f:
+                np.savez(f, key=np.array(cache_key), **data)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            print(f"Could not save vocabulary cache: {e}")
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
 
     def load_custom_words(self):
         """Load custom words from file if it exists."""
@@ -129,7 +295,16 @@ class HybridAutocorrection(object):
         word = word.lower()
         self.custom_words.add(word)
         self.vocabulary.add(word)
-        self.prob_of_word[word] = 0.001
+        self.add_to_delete_index(word)
+        if word not in self.word2id:
+            self.word2id[word] = len(self.prob_of_word)
+            self.word_counts = np.append(self.word_counts, 0)
+            self.prob_of_word = np.append(self.prob_of_word, 0.0)
+            self.neg_log_prob = np.append(self.neg_log_prob, 0.0)
+        word_id = self.word2id[word]
+        self.prob_of_word[word_id] = 0.001
+        self.neg_log_prob[word_id] = -math.log(0.001)
+        self.correct_spelling_cached.cache_clear()
         self.save_custom_words()
         print(f"Added custom word: {word}")
 
@@ -146,22 +321,47 @@ class HybridAutocorrection(object):
         else:
             self.user_feedback[original_word][suggested_word]['rejected'] += 1
         
+        self.correct_spelling_cached.cache_clear()
         self.save_custom_words()
 
-    def edit1(self, word):
-        """Generate all possible 1-edit distance variations."""
-        letter = string.ascii_lowercase
-        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
-        insert = [l + c + r for l, r in splits for c in letter]
-        delete = [l + r[1:] for l, r in splits if r]
-        replace = [l + c + r[1:] for l, r in splits if r for c in letter]
-        swap = [l + r[1] + r[0] + r[2:] for l, r in splits if len(r) > 1]
-        return set(replace + insert + delete + swap)
+    # Shared with the other checkers, see edit1_variants
+    edit1 = staticmethod(edit1_variants)
 
     def edit2(self, word):
         """Generate all possible 2-edit distance variations."""
         return [e2 for e1 in self.edit1(word) for e2 in self.edit1(e1)]
 
+    def add_to_delete_index(self, word):
+        """Index a vocabulary word under each of its delete variants."""
+        for variant in self.delete_variants(word):
+            self.delete_index.setdefault(variant, []).append(word)
+
+    def delete_variants(self, word, max_deletes=2):
+        """Generate all strings reachable by removing up to max_deletes characters (including the word itself)."""
+        variants = {word}
+        frontier = {word}
+        for _ in range(max_deletes):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            variants |= frontier
+        return variants
+
+    def candidates(self, word, max_distance=2):
+        """
+        Find vocabulary words within max_distance edits through the delete index.
+        Closer edits are tried first, so the two-edit lookup only runs when nothing is one edit away.
+        As in edit1, a swap of adjacent characters counts as one edit.
+        """
+        for distance in range(1, max_distance + 1):
+            matches = set()
+            for variant in self.delete_variants(word, distance):
+                matches.update(self.delete_index.get(variant, ()))
+            # Verify the matches by their actual edit distance
+            found = [w for w in matches
+                     if editdistance.eval(w, word) <= distance or adjacent_transposition(w, word)]
+            if found:
+                return found
+        return []
+
     def common_prefix_length(self, word1, word2):
         """Calculate the length of the common prefix between two words."""
         common_len = 0
@@ -197,25 +397,17 @@ class HybridAutocorrection(object):
     def combined_score(self, suggestion, original_word):
         """Calculate combined score using edit distance and word probability."""
         edit_score = self.custom_score(suggestion, original_word)
-        prob_score = -np.log(self.prob_of_word.get(suggestion, 1e-9))
+        prob_score = self.neg_log_prob[self.word2id.get(suggestion, 0)]
         return edit_score + prob_score
 
+    def word_probability(self, word):
+        """Get the probability of a word (1e-9 if it is unknown)."""
+        return float(self.prob_of_word[self.word2id.get(word, 0)])
+
     def should_use_context(self, word, previous_words):
         """Determine if we should use context-aware correction."""
-        # Use context for common homophones and context-dependent words
-        context_words = {
-            'there', 'their', "they're",
-            'your', "you're",
-            'its', "it's",
-            'to', 'too', 'two',
-            'where', 'wear', 'were',
-            'here', 'hear',
-            'right', 'write',
-            'know', 'no',
-            'new', 'knew'
-        }
-        
-        return word.lower() in context_words and len(previous_words) >= 1
+        # Words are already lowercase here, like the vocabulary they were checked against
+        return word in CONTEXT_WORDS and len(previous_words) >= 1
 
     def context_aware_score(self, suggestion, original_word, previous_words):
         """Calculate context-aware score using n-grams."""
@@ -225,62 +417,117 @@ class HybridAutocorrection(object):
         # Context score using bigrams and trigrams
         context_score = 0
         
+        word2id = self.word2id
+        suggestion_id = word2id.get(suggestion, 0)
+        
         if len(previous_words) >= 1:
-            bigram_prob = self.prob_of_bigram.get((previous_words[-1], suggestion), 1e-9)
-            context_score += -np.log(bigram_prob) * 2
+            bigram = pack_bigrams(word2id.get(previous_words[-1], 0), suggestion_id)
+            context_score += self.ngram_neg_log(self.bigram_keys, self.neg_log_bigram, bigram, suggestion_id) * 2
         
         if len(previous_words) >= 2:
-            trigram_prob = self.prob_of_trigram.get((previous_words[-2], previous_words[-1], suggestion), 1e-9)
-            context_score += -np.log(trigram_prob) * 3
+            trigram = pack_trigrams(word2id.get(previous_words[-2], 0), word2id.get(previous_words[-1], 0), suggestion_id)
+            context_score += self.ngram_neg_log(self.trigram_keys, self.neg_log_trigram, trigram, suggestion_id) * 3
         
+        return base_score + context_score + self.feedback_score(suggestion, original_word)
+
+    def feedback_score(self, suggestion, original_word):
+        """Calculate the user feedback score plus the custom word bonus."""
         # User feedback score
         feedback_score = 0
         if original_word in self.user_feedback and suggestion in self.user_feedback[original_word]:
             feedback = self.user_feedback[original_word][suggestion]
-            total = feedback['accepted'] + feedback['rejected']
-            if total > 0:
-                acceptance_rate = feedback['accepted'] / total
-                feedback_score = -np.log(1 - acceptance_rate) * 1.5
+            # Laplace-smoothed log odds of acceptance, negated as lower scores rank first.
+            # Always finite, even when every suggestion was accepted.
+            feedback_score = -math.log((feedback['accepted'] + 1) / (feedback['rejected'] + 1)) * 1.5
         
         # Custom word bonus
         custom_bonus = 0
         if suggestion in self.custom_words:
             custom_bonus = -3
         
-        return base_score + context_score + feedback_score + custom_bonus
+        return feedback_score + custom_bonus
+
+    def rank_candidates(self, best_guesses, word, previous_words=None, limit=None):
+        """
+        Sort candidates by combined_score, or by context_aware_score when previous_words is given,
+        scoring the whole batch in one compiled kernel call when Numba is available.
+        With a limit, only the best `limit` candidates are returned.
+        """
+        if njit is None:
+            if previous_words is None:
+                return sorted(best_guesses, key=lambda w: self.combined_score(w, word))[:limit]
+            return sorted(best_guesses, key=lambda w: self.context_aware_score(w, word, previous_words))[:limit]
+
+        # Edit score + word probability for every candidate at once (combined_score)
+        count = len(best_guesses)
+        word2id = self.word2id
+        ids = [word2id.get(w, 0) for w in best_guesses]
+        neg_log_probs = self.neg_log_prob[ids]
+        cand_chars, cand_lens = pack_words(best_guesses)
+        orig_chars = pack_words([word])[0][0]
+        scores = score_candidates(cand_chars, orig_chars, cand_lens, len(word), neg_log_probs)
+
+        if previous_words is not None:
+            # Same context weights as context_aware_score
+            if len(previous_words) >= 1:
+                previous = word2id.get(previous_words[-1], 0)
+                bigrams = pack_bigrams(previous, ids)
+                scores += self.ngram_neg_log(self.bigram_keys, self.neg_log_bigram, bigrams, ids) * 2
+            if len(previous_words) >= 2:
+                before = word2id.get(previous_words[-2], 0)
+                trigrams = pack_trigrams(before, previous, ids)
+                scores += self.ngram_neg_log(self.trigram_keys, self.neg_log_trigram, trigrams, ids) * 3
+            scores += np.fromiter((self.feedback_score(w, word) for w in best_guesses), dtype=np.float64, count=count)
+
+        if limit is not None and count > limit:
+            # Partial sort: keep every score up to the limit-th smallest, then order just those.
+            # Ties stay in input order, so the result is the same prefix the full stable sort gives.
+            kth = np.partition(scores, limit - 1)[limit - 1]
+            top = np.flatnonzero(scores <= kth)
+            return [best_guesses[i] for i in top[np.argsort(scores[top], kind="stable")][:limit]]
+        return [best_guesses[i] for i in np.argsort(scores, kind="stable")]
 
     def correct_spelling_hybrid(self, previous_words, word):
         """
         Hybrid spelling correction that intelligently chooses between approaches.
         """
+        # Only the last two previous words affect the result, so they make up the cache key
+        return list(self.correct_spelling_cached(tuple(previous_words[-2:]), word))
+
+    def correct_spelling_uncached(self, previous_words, word):
+        """Compute the hybrid corrections for a word, as a tuple so the result can be cached."""
         if word in self.vocabulary:
-            return [(word, self.prob_of_word[word], 1.0)]
+            return ((word, self.word_probability(word), 1.0),)
 
-        suggestions = self.edit1(word).union(self.edit2(word))
-        best_guesses = [w for w in suggestions if w in self.vocabulary]
+        # Only in-vocabulary words come out of the delete index, so no filtering is needed
+        best_guesses = self.candidates(word)
         
         if not best_guesses:
-            return [(word, 0, 0)]
+            return ((word, 0, 0),)
 
         # Choose approach based on word type and context
         if self.should_use_context(word, previous_words):
             # Use context-aware approach for homophones
-            best_guesses.sort(key=lambda w: self.context_aware_score(w, word, previous_words))
+            best_guesses = self.rank_candidates(best_guesses, word, previous_words, limit=5)
         else:
             # Use traditional approach for regular misspellings
-            best_guesses.sort(key=lambda w: self.combined_score(w, word))
+            best_guesses = self.rank_candidates(best_guesses, word, limit=5)
         
-        return [(w, self.prob_of_word[w], self.get_context_probability(w, previous_words)) for w in best_guesses[:5]]
+        return tuple((w, self.word_probability(w), self.get_context_probability(w, previous_words)) for w in best_guesses)
 
     def get_context_probability(self, word, previous_words):
         """Get the context probability for a word given previous words."""
+        word2id = self.word2id
+        word_id = word2id.get(word, 0)
         if len(previous_words) >= 2:
-            trigram_prob = self.prob_of_trigram.get((previous_words[-2], previous_words[-1], word), 0)
-            if trigram_prob > 0:
-                return trigram_prob
+            trigram = pack_trigrams(word2id.get(previous_words[-2], 0), word2id.get(previous_words[-1], 0), word_id)
+            trigram_count = self.trigram_counts[self.ngram_positions(self.trigram_keys, trigram)]
+            if trigram_count > 0:
+                return float(trigram_count / self.total_trigrams)
         
         if len(previous_words) >= 1:
-            return self.prob_of_bigram.get((previous_words[-1], word), 0)
+            bigram = pack_bigrams(word2id.get(previous_words[-1], 0), word_id)
+            return float(self.bigram_counts[self.ngram_positions(self.bigram_keys, bigram)] / self.total_bigrams)
         
         return 0
 
@@ -288,8 +535,8 @@ class HybridAutocorrection(object):
         """Get statistics about the corpus."""
         return {
             'total_words': len(self.vocabulary),
-            'total_bigrams': len(self.bigrams),
-            'total_trigrams': len(self.trigrams),
+            'total_bigrams': int(self.total_bigrams),
+            'total_trigrams': int(self.total_trigrams),
             'custom_words': len(self.custom_words),
             'user_feedback_entries': len(self.user_feedback)
         } 
\ No newline at end of file
@@ -3,32 +3,11 @@
 Debug script to show how auto-correction suggestions are generated
 """
 
-import string
-import re
-from collections import Counter
 import editdistance
-import numpy as np
-import nltk
-from nltk.corpus import brown, reuters
-import json
-import os
+from autocorrect_package.hybrid_autocorrection import HybridAutocorrection
 
-def edit1(word):
-    """Generate all possible 1-edit distance variations."""
-    letter = string.ascii_lowercase
-    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
-    insert = [l + c + r for l, r in splits for c in letter]
-    delete = [l + r[1:] for l, r in splits if r]
-    replace = [l + c + r[1:] for l, r in splits if r for c in letter]
-    swap = [l + r[1] + r[0] + r[2:] for l, r in splits if len(r) > 1]
-    return set(replace + insert + delete + swap)
-
-def edit2(word):
-    """Generate all possible 2-edit distance variations."""
-    return [e2 for e1 in edit1(word) for e2 in edit1(e1)]
-
-def debug_suggestions(word, mode="enhanced"):
-    """Debug how suggestions are generated for a word."""
+def debug_suggestions(word, corrector, mode="enhanced"):
+    """Debug how suggestions are generated for a word, using the corrector's edit functions and vocabulary."""
     
     print(f"🔍 DEBUGGING SUGGESTIONS FOR: '{word}'")
     print(f"📋 MODE: {mode.upper()}")
@@ -36,8 +15,8 @@ def debug_suggestions(word, mode="enhanced"):
     
     # Step 1: Generate edit distance variations
     print("1️⃣ GENERATING EDIT DISTANCE VARIATIONS:")
-    edit1_variations = edit1(word)
-    edit2_variations = edit2(word)
+    edit1_variations = corrector.edit1(word)
+    edit2_variations = corrector.edit2(word)
     all_variations = edit1_variations.union(set(edit2_variations))
     
     print(f"   Edit-1 variations: {len(edit1_variations)}")
@@ -48,57 +27,18 @@ def debug_suggestions(word, mode="enhanced"):
     edit1_examples = list(edit1_variations)[:10]
     print(f"   Edit-1 examples: {edit1_examples}")
     
-    # Step 2: Load vocabulary based on mode
+    # Step 2: Use the vocabulary of the corrector for this mode
     print(f"\n2️⃣ LOADING VOCABULARY ({mode.upper()} MODE):")
     
     if mode == "enhanced":
-        # Load enhanced vocabulary
-        try:
-            # Load custom words
-            custom_words = set()
-            if os.path.exists('custom_words.json'):
-                with open('custom_words.json', 'r') as f:
-                    data = json.load(f)
-                    custom_words = set(data.get('words', []))
-            
-            # Load original corpus
-            with open("autocorrect_package/corpus2.txt", "r", encoding="utf-8") as file:
-                original_words = []
-                lines = file.readlines()
-                for line in lines:
-                    original_words += re.findall(r'\w+', line.lower())
-            
-            # Load large corpora
-            brown_words = [word.lower() for word in brown.words() if word.isalpha()]
-            reuters_words = [word.lower() for word in reuters.words() if word.isalpha()]
-            
-            # Combine all vocabularies
-            all_words = original_words + brown_words + reuters_words + list(custom_words)
-            vocabulary = set(all_words)
-            
-            print(f"   Original corpus words: {len(set(original_words))}")
-            print(f"   Brown corpus words: {len(set(brown_words))}")
-            print(f"   Reuters corpus words: {len(set(reuters_words))}")
-            print(f"   Custom words: {len(custom_words)}")
-            print(f"   Total vocabulary: {len(vocabulary)}")
-            
-        except Exception as e:
-            print(f"   Error loading enhanced vocabulary: {e}")
-            return
-            
+        # Corpus vocabulary (original + Brown + Reuters) plus custom words
+        vocabulary = corrector.vocabulary | corrector.custom_words
+        print(f"   Corpus words: {len(corrector.vocabulary)}")
+        print(f"   Custom words: {len(corrector.custom_words)}")
+        print(f"   Total vocabulary: {len(vocabulary)}")
     else:
-        # Load basic vocabulary
-        try:
-            with open("autocorrect_package/corpus2.txt", "r", encoding="utf-8") as file:
-                words = []
-                lines = file.readlines()
-                for line in lines:
-                    words += re.findall(r'\w+', line.lower())
-            vocabulary = set(words)
-            print(f"   Basic vocabulary: {len(vocabulary)} words")
-        except Exception as e:
-            print(f"   Error loading basic vocabulary: {e}")
-            return
+        vocabulary = corrector.vocabulary
+        print(f"   Basic vocabulary: {len(vocabulary)} words")
     
     # Step 3: Filter variations by vocabulary
     print(f"\n3️⃣ FILTERING BY VOCABULARY:")
@@ -145,14 +85,18 @@ def main():
     print("🔧 AUTO-CORRECTION SUGGESTION DEBUGGER")
     print("=" * 60)
     
+    # Load each vocabulary once and reuse it for every test word
+    basic_corrector = HybridAutocorrection(use_large_corpora=False, cache_file=None)
+    enhanced_corrector = HybridAutocorrection()
+    
     for word in test_words:
         print(f"\n{'='*20} TESTING '{word.upper()}' {'='*20}")
         
         # Test in basic mode
-        debug_suggestions(word, "basic")
+        debug_suggestions(word, basic_corrector, "basic")
         
         # Test in enhanced mode
-        debug_suggestions(word, "enhanced")
+        debug_suggestions(word, enhanced_corrector, "enhanced")
         
         print("\n" + "="*60)
 
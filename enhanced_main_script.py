@@ -6,6 +6,39 @@ from autocorrect_package.autocorrection import Autocorrection
 import language_tool_python
 import re
 import time
+import queue
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+# Most recently checked texts whose grammar matches are kept
+GRAMMAR_CACHE_SIZE = 512
+
+# Most recently used words whose synonyms are kept for the badges
+SYNONYM_CACHE_SIZE = 4096
+
+# Words of three or more word characters that get synonym badges
+BADGE_WORD_RE = re.compile(r'\w{3,}')
+# A typed word and its trailing punctuation
+WORD_PUNCT_RE = re.compile(r"([\w']+)([.,;!?:]*)")
+# Sentence-ending punctuation
+SENTENCE_ENDINGS = ".!?"
+
+# Milliseconds without edits before the pending grammar check runs
+GRAMMAR_CHECK_DELAY = 300
+
+# Long-running LanguageTool HTTP server shared by every session, and the settings for a local one
+LANGUAGETOOL_SERVER = 'http://localhost:8081'
+LANGUAGETOOL_CONFIG = {'maxCheckThreads': 4, 'cacheSize': 10000, 'pipelineCaching': True}
+
+def create_grammar_tool():
+    """Connect to the shared LanguageTool server, or start a local one if none is reachable."""
+    try:
+        return language_tool_python.LanguageTool('en-US', remote_server=LANGUAGETOOL_SERVER)
+    except Exception as e:
+        print(f"No LanguageTool server at {LANGUAGETOOL_SERVER} ({e}), starting a local one...")
+        return language_tool_python.LanguageTool('en-US', config=LANGUAGETOOL_CONFIG)
 
 class EnhancedAutoCorrectApp(tk.Tk):
     def __init__(self):
@@ -17,15 +50,32 @@ class EnhancedAutoCorrectApp(tk.Tk):
         print("Initializing Enhanced Auto-Correction System...")
         self.enhanced_checker = EnhancedAutocorrection(use_large_corpora=True)
         
-        # Initialize the original autocorrection system for medium mode
-        print("Initializing Original Auto-Correction System...")
-        self.original_checker = Autocorrection("autocorrect_package/corpus2.txt")
+        # The original autocorrection system for medium and basic mode is loaded on first use
+        self._original_checker = None
         
         # Set default checker
         self.checker = self.enhanced_checker
 
+        # Corrections repeat for the same word and context while editing, so cache them per mode
+        self.cached_corrections = lru_cache(maxsize=4096)(self.correct_word)
+
+        # User feedback is recorded (and saved) by a background thread, off the typing path
+        self.feedback_queue = queue.Queue()
+        threading.Thread(target=self.record_feedback_worker, daemon=True).start()
+
         # Initialize the grammar checker
-        self.grammar_tool = language_tool_python.LanguageTool('en-US')
+        self.grammar_tool = create_grammar_tool()
+        # Grammar checks run on one background thread; only the latest request's result is shown
+        self.grammar_pool = ThreadPoolExecutor(max_workers=1)
+        self.grammar_request_id = 0
+        self.grammar_future = None
+        # Synonyms by lowercase word for the badges, oldest first
+        self.synonym_cache = OrderedDict()
+        # (start, end) character span waiting for a grammar check, and the after() id that will run it
+        self.grammar_dirty = None
+        self.pending_grammar_check = None
+        # Grammar matches by exact checked text (match offsets are relative to it), oldest first
+        self.grammar_cache = OrderedDict()
 
         # Create main frame
         self.main_frame = ttk.Frame(self)
@@ -45,15 +95,27 @@ class EnhancedAutoCorrectApp(tk.Tk):
         self.previous_words = []
         self.grammar_popup = None
         self.correction_history = []
-        self.synonym_popup = None
+        self.create_synonym_popup()
         self.last_synonym_tag = None
         self.last_synonym_badge_index = None
+        # Pending after() id for the debounced suggestion update
+        self.pending_suggestions = None
 
         # Bind events
         self.bind_events()
 
-        # Show initial stats
+        # Show initial stats, then refresh them at most once a second when they change
+        self.stats_dirty = False
         self.update_stats()
+        self.after(1000, self.flush_stats)
+
+    @property
+    def original_checker(self):
+        """The original autocorrection system, loaded the first time medium or basic mode needs it."""
+        if self._original_checker is None:
+            print("Initializing Original Auto-Correction System...")
+            self._original_checker = Autocorrection("autocorrect_package/corpus2.txt")
+        return self._original_checker
 
     def create_control_panel(self):
         """Create the top control panel with buttons and options."""
@@ -109,6 +171,8 @@ class EnhancedAutoCorrectApp(tk.Tk):
 
         # Configure grammar error highlighting
         self.input_box.tag_configure("grammar_error", background="#ffcccc")
+        # Configure the badge on the hovered word that has synonyms
+        self.input_box.tag_configure("synonym_badge", foreground="blue", underline=True)
 
         # Right side - Suggestions
         right_frame = ttk.Frame(text_frame)
@@ -169,6 +233,9 @@ class EnhancedAutoCorrectApp(tk.Tk):
         self.input_box.bind("!", self.on_sentence_end)
         self.input_box.bind("?", self.on_sentence_end)
         self.suggestion_listbox.bind("<<ListboxSelect>>", self.on_listbox_select)
+        # Synonyms are looked up only for the word under the pointer
+        self.input_box.bind("<Motion>", self.on_text_motion)
+        self.input_box.bind("<Leave>", lambda e: self.clear_synonym_badge())
 
     def on_key_release(self, event):
         """Handle key release events for real-time suggestions."""
@@ -178,6 +245,14 @@ class EnhancedAutoCorrectApp(tk.Tk):
         self.current_word = current_line[-1] if current_line else ""
         self.previous_words = current_line[:-1] if len(current_line) > 1 else []
         
+        # Debounce: only refresh suggestions once typing pauses, for the latest word
+        if self.pending_suggestions is not None:
+            self.after_cancel(self.pending_suggestions)
+        self.pending_suggestions = self.after(120, self.show_debounced_suggestions)
+
+    def show_debounced_suggestions(self):
+        """Run the suggestion update scheduled by on_key_release."""
+        self.pending_suggestions = None
         self.autocorrect_suggestions()
 
     def on_space_bar_press(self, event):
@@ -190,7 +265,7 @@ class EnhancedAutoCorrectApp(tk.Tk):
             return
 
         # Separate punctuation
-        match = re.match(r"([\w']+)([.,;!?:]*)", word)
+        match = WORD_PUNCT_RE.match(word)
         if match:
             word_part = match.group(1).lower()
             punct_part = match.group(2)
@@ -199,13 +274,7 @@ class EnhancedAutoCorrectApp(tk.Tk):
             punct_part = ""
 
         # Get corrections based on mode
-        mode = self.mode_var.get()
-        if mode == "enhanced":
-            corrections = self.enhanced_checker.correct_spelling_enhanced(self.previous_words, word_part)
-        elif mode == "medium":
-            corrections = self.original_checker.correct_spelling_with_context(self.previous_words[-1] if self.previous_words else "", word_part)
-        else:  # basic mode
-            corrections = self.original_checker.correct_spelling(word_part)
+        corrections = self.get_corrections(self.mode_var.get(), word_part)
 
         if corrections and corrections[0][0] != word_part:
             correct_word = corrections[0][0]
@@ -218,8 +287,6 @@ class EnhancedAutoCorrectApp(tk.Tk):
 
         self.current_word = ""
         self.grammar_check_last_sentence()
-        # Insert synonym badge after the last word
-        self.insert_synonym_badge()
 
     def autocorrect_suggestions(self):
         """Show auto-correction suggestions."""
@@ -232,30 +299,35 @@ class EnhancedAutoCorrectApp(tk.Tk):
 
         # Get suggestions based on mode
         mode = self.mode_var.get()
-        if mode == "enhanced":
-            corrections = self.enhanced_checker.correct_spelling_enhanced(self.previous_words, word)
-        elif mode == "medium":
-            corrections = self.original_checker.correct_spelling_with_context(self.previous_words[-1] if self.previous_words else "", word)
-        else:  # basic mode
-            corrections = self.original_checker.correct_spelling(word)
+        corrections = self.get_corrections(mode, word)
 
         self.suggestion_listbox.delete(0, tk.END)
         synonyms_text = ""
         if corrections:
-            for i, correction in enumerate(corrections[:5]):
-                # For enhanced mode, correction may have synonyms as the 5th element
-                if mode == "enhanced" and len(correction) >= 5:
-                    word_suggestion = correction[0]
-                    synonyms = correction[4]
-                    if i == 0 and synonyms:
-                        synonyms_text = f"Synonyms: {', '.join(synonyms)}"
-                    self.suggestion_listbox.insert(tk.END, word_suggestion)
-                else:
-                    self.suggestion_listbox.insert(tk.END, correction[0])
+            # For enhanced mode, the top correction may have synonyms as the 5th element
+            top = corrections[0]
+            if mode == "enhanced" and len(top) >= 5 and top[4]:
+                synonyms_text = f"Synonyms: {', '.join(top[4])}"
+            # Fill the listbox in one Tk call
+            self.suggestion_listbox.insert(tk.END, *(correction[0] for correction in corrections[:5]))
         # Update the synonym label
         if hasattr(self, 'synonym_label'):
             self.synonym_label.config(text=synonyms_text)
 
+    def get_corrections(self, mode, word):
+        """Get the corrections for a word in the given mode, reusing cached results."""
+        # Enhanced mode looks at up to two previous words, so they are part of the cache key
+        return self.cached_corrections(mode, tuple(self.previous_words[-2:]), word)
+
+    def correct_word(self, mode, previous_words, word):
+        """Run the checker for the given mode on a word."""
+        if mode == "enhanced":
+            return self.enhanced_checker.correct_spelling_enhanced(list(previous_words), word)
+        elif mode == "medium":
+            return self.original_checker.correct_spelling_with_context(previous_words[-1] if previous_words else "", word, limit=5)
+        else:  # basic mode
+            return self.original_checker.correct_spelling(word, limit=5)
+
     def on_listbox_select(self, event):
         """Handle suggestion selection."""
         if not self.suggestion_listbox.curselection():
@@ -277,18 +349,82 @@ class EnhancedAutoCorrectApp(tk.Tk):
 
     def grammar_check_last_sentence(self):
         """Check grammar for the last sentence."""
-        full_text = self.input_box.get("1.0", tk.END)
-        sentences = re.split(r'([.!?])', full_text.strip())
-        
-        if len(sentences) >= 3:
-            last_sentence = sentences[-3] + sentences[-2]
-            start_idx = full_text.rfind(last_sentence)
+        full_text = self.input_box.get("1.0", "end-1c").rstrip()
+
+        # The last sentence runs from just after the second-to-last ending to the last one
+        end_idx = max(full_text.rfind(c) for c in SENTENCE_ENDINGS) + 1
+        if end_idx > 0:
+            start_idx = max(full_text.rfind(c, 0, end_idx - 1) for c in SENTENCE_ENDINGS) + 1
         else:
-            last_sentence = sentences[0]
-            start_idx = full_text.rfind(last_sentence)
+            # No sentence has ended yet, so the whole text is checked
+            start_idx, end_idx = len(full_text) - len(full_text.lstrip()), len(full_text)
+
+        self.schedule_grammar_check(start_idx, end_idx)
+
+    def schedule_grammar_check(self, start_idx, end_idx=None):
+        """
+        Mark a span of the text (to the end when end_idx is None) as needing a grammar check.
+        Spans marked in a burst of edits are merged and checked together once editing pauses.
+        """
+        if self.grammar_dirty is None:
+            self.grammar_dirty = (start_idx, end_idx)
+        else:
+            dirty_start, dirty_end = self.grammar_dirty
+            if end_idx is not None and dirty_end is not None:
+                end_idx = max(end_idx, dirty_end)
+            else:
+                end_idx = None
+            self.grammar_dirty = (min(start_idx, dirty_start), end_idx)
+
+        if self.pending_grammar_check is not None:
+            self.after_cancel(self.pending_grammar_check)
+        self.pending_grammar_check = self.after(GRAMMAR_CHECK_DELAY, self.run_grammar_check)
+
+    def run_grammar_check(self):
+        """Check the merged dirty span with one LanguageTool request."""
+        start_idx, end_idx = self.grammar_dirty
+        self.grammar_dirty = None
+        self.pending_grammar_check = None
+
+        full_text = self.input_box.get("1.0", tk.END)
+        if end_idx is None:
+            end_idx = len(full_text.rstrip())
+        text = full_text[start_idx:end_idx]
+
+        # A check still waiting in the queue is out of date now, so drop it
+        if self.grammar_future is not None:
+            self.grammar_future.cancel()
+        self.grammar_request_id += 1
+        request_id = self.grammar_request_id
+
+        # Text that was already checked doesn't go back to LanguageTool
+        matches = self.grammar_cache.get(text)
+        if matches is not None:
+            self.grammar_cache.move_to_end(text)
+            self.apply_grammar_matches(matches, start_idx, start_idx + len(text))
+            return
+
+        future = self.grammar_future = self.grammar_pool.submit(self.grammar_tool.check, text)
+        # Hand the result back to the Tk main thread
+        future.add_done_callback(lambda f: self.after(0, self.finish_grammar_check, request_id, f, text, start_idx))
+
+    def finish_grammar_check(self, request_id, future, text, start_idx):
+        """Cache the matches of a finished grammar check and show them, unless a newer check was started."""
+        if future.cancelled():
+            return
+
+        matches = future.result()
+        self.grammar_cache[text] = matches
+        if len(self.grammar_cache) > GRAMMAR_CACHE_SIZE:
+            self.grammar_cache.popitem(last=False)
+
+        if request_id == self.grammar_request_id:
+            self.apply_grammar_matches(matches, start_idx, start_idx + len(text))
 
-        matches = self.grammar_tool.check(last_sentence)
-        self.input_box.tag_remove("grammar_error", "1.0", tk.END)
+    def apply_grammar_matches(self, matches, start_idx, end_idx):
+        """Highlight the grammar errors in the checked span and show their suggestions."""
+        # Only the checked span is re-highlighted, so only its old highlights are cleared
+        self.input_box.tag_remove("grammar_error", f"1.0+{start_idx}c", f"1.0+{end_idx}c")
 
         if matches:
             suggestions = []
@@ -304,6 +440,7 @@ class EnhancedAutoCorrectApp(tk.Tk):
             self.show_grammar_popup(matches, start_idx)
         else:
             self.grammar_label.config(text="")
+            self.close_grammar_popup()
 
     def show_grammar_popup(self, matches, start_idx):
         """Show grammar suggestions popup."""
@@ -321,8 +458,13 @@ class EnhancedAutoCorrectApp(tk.Tk):
             close_btn = ttk.Button(self.grammar_popup, text="Close", 
                                  command=self.close_grammar_popup)
             close_btn.pack(pady=5)
+            # Closing only hides the popup, so the next suggestions reuse the same window
+            self.grammar_popup.protocol("WM_DELETE_WINDOW", self.close_grammar_popup)
             
             self.after(100, self.input_box.focus_set)
+        elif self.grammar_popup.state() == "withdrawn":
+            self.grammar_popup.deiconify()
+            self.after(100, self.input_box.focus_set)
 
         for widget in self.suggestions_frame.winfo_children():
             widget.destroy()
@@ -349,8 +491,7 @@ class EnhancedAutoCorrectApp(tk.Tk):
     def close_grammar_popup(self):
         """Close the grammar popup."""
         if self.grammar_popup:
-            self.grammar_popup.destroy()
-            self.grammar_popup = None
+            self.grammar_popup.withdraw()
 
     def apply_grammar_correction(self, match, suggestion, start_idx):
         """Apply a grammar correction."""
@@ -361,17 +502,9 @@ class EnhancedAutoCorrectApp(tk.Tk):
         
         self.input_box.delete(start_index, end_index)
         self.input_box.insert(start_index, suggestion)
-        self.input_box.tag_remove("grammar_error", "1.0", tk.END)
-        self.update_grammar_popup()
-
-    def update_grammar_popup(self):
-        """Update the grammar popup with remaining suggestions."""
-        full_text = self.input_box.get("1.0", tk.END)
-        matches = self.grammar_tool.check(full_text)
-        if matches:
-            self.show_grammar_popup(matches, 0)
-        else:
-            self.close_grammar_popup()
+        self.input_box.tag_remove("grammar_error", f"1.0+{start_idx}c", tk.END)
+        # Re-check from the corrected text on; corrections applied in a row share one check
+        self.schedule_grammar_check(start_idx)
 
     def show_add_custom_word_dialog(self):
         """Show dialog to add custom words."""
@@ -397,7 +530,8 @@ class EnhancedAutoCorrectApp(tk.Tk):
             word = word_var.get().strip().lower()
             if word:
                 self.enhanced_checker.add_custom_word(word)
-                self.update_stats()
+                self.cached_corrections.cache_clear()
+                self.stats_dirty = True
                 dialog.destroy()
                 messagebox.showinfo("Success", f"Added custom word: {word}")
 
@@ -430,20 +564,16 @@ class EnhancedAutoCorrectApp(tk.Tk):
         custom_words_list.configure(yscrollcommand=scrollbar.set)
 
         # Populate list
-        for word in sorted(self.enhanced_checker.custom_words):
-            custom_words_list.insert(tk.END, word)
+        custom_words_list.insert(tk.END, *sorted(self.enhanced_checker.custom_words))
 
         def delete_word():
             selection = custom_words_list.curselection()
             if selection:
                 word = custom_words_list.get(selection[0])
-                self.enhanced_checker.custom_words.discard(word)
-                self.enhanced_checker.vocabulary.discard(word)
-                if word in self.enhanced_checker.prob_of_word:
-                    del self.enhanced_checker.prob_of_word[word]
-                self.enhanced_checker.save_custom_words()
+                self.enhanced_checker.remove_custom_word(word)
+                self.cached_corrections.cache_clear()
                 custom_words_list.delete(selection[0])
-                self.update_stats()
+                self.stats_dirty = True
 
         button_frame = ttk.Frame(dialog)
         button_frame.pack(fill="x", padx=10, pady=10)
@@ -489,7 +619,8 @@ class EnhancedAutoCorrectApp(tk.Tk):
             full_word = word_var.get().strip().lower()
             if shortcut and full_word:
                 self.enhanced_checker.add_shortcut(shortcut, full_word)
-                self.update_stats()
+                self.cached_corrections.cache_clear()
+                self.stats_dirty = True
                 dialog.destroy()
                 messagebox.showinfo("Success", f"Added shortcut: '{shortcut}' → '{full_word}'")
             else:
@@ -529,8 +660,9 @@ class EnhancedAutoCorrectApp(tk.Tk):
                 shortcut_text = shortcuts_list.get(selection[0])
                 shortcut = shortcut_text.split(" → ")[0]
                 if self.enhanced_checker.remove_shortcut(shortcut):
+                    self.cached_corrections.cache_clear()
                     shortcuts_list.delete(selection[0])
-                    self.update_stats()
+                    self.stats_dirty = True
 
         button_frame = ttk.Frame(dialog)
         button_frame.pack(fill="x", padx=10, pady=10)
@@ -540,8 +672,7 @@ class EnhancedAutoCorrectApp(tk.Tk):
 
         # Load shortcuts
         shortcuts = self.enhanced_checker.get_all_shortcuts()
-        for shortcut, full_word in sorted(shortcuts.items()):
-            shortcuts_list.insert(tk.END, f"{shortcut} → {full_word}")
+        shortcuts_list.insert(tk.END, *(f"{shortcut} → {full_word}" for shortcut, full_word in sorted(shortcuts.items())))
 
     def show_performance_stats(self):
         """Show detailed performance statistics."""
@@ -598,9 +729,28 @@ Features Available:
         
         # Only record feedback in enhanced mode
         if self.mode_var.get() == "enhanced":
-            self.enhanced_checker.record_user_feedback(original_word, corrected_word, True)
+            self.feedback_queue.put((original_word, corrected_word, True))
         
-        self.update_stats()
+        self.stats_dirty = True
+
+    def record_feedback_worker(self):
+        """Record queued user feedback with the enhanced checker, one item at a time."""
+        while True:
+            original_word, corrected_word, accepted = self.feedback_queue.get()
+            try:
+                self.enhanced_checker.record_user_feedback(original_word, corrected_word, accepted)
+                self.cached_corrections.cache_clear()
+            except Exception as e:
+                print(f"Could not record user feedback: {e}")
+            finally:
+                self.feedback_queue.task_done()
+
+    def flush_stats(self):
+        """Refresh the statistics display if anything changed since the last refresh."""
+        if self.stats_dirty:
+            self.stats_dirty = False
+            self.update_stats()
+        self.after(1000, self.flush_stats)
 
     def update_stats(self):
         """Update the statistics display."""
@@ -625,83 +775,69 @@ Features Available:
     def run(self):
         """Start the application."""
         self.mainloop()
+        # Let queued feedback be recorded before the checker's exit handler saves it
+        self.feedback_queue.join()
+
+    def on_text_motion(self, event):
+        """Badge the word under the pointer and show its synonyms."""
+        index = self.input_box.index(f"@{event.x},{event.y}")
+        word_start = self.input_box.index(f"{index} wordstart")
+        # Still over the same word, so its badge and popup are already up
+        if word_start == self.last_synonym_badge_index:
+            return
+        self.clear_synonym_badge()
+        self.last_synonym_badge_index = word_start
 
-    def insert_synonym_badge(self):
-        # Remove all previous synonym tags and popups
+        if self.mode_var.get() != "enhanced":
+            return
+        word_end = f"{index} wordend"
+        word = self.input_box.get(word_start, word_end)
+        if not BADGE_WORD_RE.fullmatch(word):
+            return
+        synonyms = self.get_cached_synonyms(word)
+        if synonyms:
+            self.input_box.tag_add("synonym_badge", word_start, word_end)
+            self.show_synonym_popup(event, word, synonyms)
+
+    def clear_synonym_badge(self):
+        """Remove the synonym badge and hide its popup."""
         self.input_box.tag_remove("synonym_badge", "1.0", tk.END)
-        if hasattr(self, 'synonym_popup') and self.synonym_popup:
-            self.synonym_popup.destroy()
-            self.synonym_popup = None
+        self.hide_synonym_popup()
         self.last_synonym_badge_index = None
 
-        # Get all words in the text
-        text = self.input_box.get("1.0", tk.END).rstrip("\n")
-        if not text:
-            print("No text in input_box.")
-            return
-        words = text.split()
-        if not words:
-            print("No words found.")
-            return
+    def get_cached_synonyms(self, word):
+        """Get the synonyms of a word, looking each word up only once."""
+        key = word.lower()
+        synonyms = self.synonym_cache.get(key)
+        if synonyms is None:
+            synonyms = self.enhanced_checker.get_synonyms(word)
+            self.synonym_cache[key] = synonyms
+            if len(self.synonym_cache) > SYNONYM_CACHE_SIZE:
+                self.synonym_cache.popitem(last=False)
+        else:
+            self.synonym_cache.move_to_end(key)
+        return synonyms
 
-        # Tag every word with synonyms
-        idx = "1.0"
-        chars_seen = 0
-        line_start = int(self.input_box.index('end-1c').split('.')[0])
-        text_no_trail = text.rstrip()
-        for word in words:
-            if len(word) < 3:
-                chars_seen += len(word) + 1  # +1 for space or punctuation
-                continue
-            mode = self.mode_var.get()
-            synonyms = []
-            if mode == "enhanced":
-                synonyms = self.enhanced_checker.get_synonyms(word)
-            if not synonyms:
-                chars_seen += len(word) + 1
-                continue
-            # Find the line and column of the word
-            word_start_idx = None
-            chars_counted = 0
-            for line_num in range(1, line_start+1):
-                line_text = self.input_box.get(f"{line_num}.0", f"{line_num}.end")
-                if chars_counted + len(line_text) >= chars_seen:
-                    col = chars_seen - chars_counted
-                    word_start_idx = f"{line_num}.{col}"
-                    break
-                chars_counted += len(line_text) + 1  # +1 for newline
-            if not word_start_idx:
-                chars_seen += len(word) + 1
-                continue
-            word_end_idx = f"{word_start_idx}+{len(word)}c"
-            tag_name = "synonym_badge"
-            self.input_box.tag_add(tag_name, word_start_idx, word_end_idx)
-            self.input_box.tag_configure(tag_name, foreground="blue", underline=True)
-            self.input_box.tag_bind(tag_name, "<Enter>", lambda e, w=word, s=synonyms: self.show_synonym_popup(e, w, s))
-            self.input_box.tag_bind(tag_name, "<Leave>", lambda e: self.hide_synonym_popup())
-            self.input_box.tag_bind(tag_name, "<Button-1>", lambda e, w=word, s=synonyms: self.show_synonym_popup(e, w, s))
-            print(f"Tagged word '{word}' at {word_start_idx}")
-            chars_seen += len(word) + 1  # +1 for space or punctuation
-        # Restore the cursor to the end
-        self.input_box.mark_set(tk.INSERT, tk.END)
+    def create_synonym_popup(self):
+        # One hidden popup, moved and refilled on every hover instead of being recreated
+        self.synonym_popup = tk.Toplevel(self)
+        self.synonym_popup.wm_overrideredirect(True)
+        self.synonym_popup.withdraw()
+        self.synonym_popup_label = tk.Label(self.synonym_popup, background="lightyellow", borderwidth=1, relief="solid", justify="left")
+        self.synonym_popup_label.pack(ipadx=5, ipady=3)
 
     def show_synonym_popup(self, event, word, synonyms):
-        if hasattr(self, 'synonym_popup') and self.synonym_popup:
-            self.synonym_popup.destroy()
         if not synonyms:
+            self.hide_synonym_popup()
             return
         x = self.input_box.winfo_rootx() + event.x
         y = self.input_box.winfo_rooty() + event.y + 20
-        self.synonym_popup = tk.Toplevel(self)
-        self.synonym_popup.wm_overrideredirect(True)
         self.synonym_popup.geometry(f"+{x}+{y}")
-        label = tk.Label(self.synonym_popup, text=f"Synonyms for '{word}':\n" + ", ".join(synonyms), background="lightyellow", borderwidth=1, relief="solid", justify="left")
-        label.pack(ipadx=5, ipady=3)
+        self.synonym_popup_label.config(text=f"Synonyms for '{word}':\n" + ", ".join(synonyms))
+        self.synonym_popup.deiconify()
 
     def hide_synonym_popup(self):
-        if hasattr(self, 'synonym_popup') and self.synonym_popup:
-            self.synonym_popup.destroy()
-            self.synonym_popup = None
+        self.synonym_popup.withdraw()
 
 if __name__ == "__main__":
     app = EnhancedAutoCorrectApp()
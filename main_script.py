@@ -1,18 +1,64 @@
 import tkinter as tk
-import numpy as np
 from autocorrect_package.autocorrection import Autocorrection
 import language_tool_python
 import re
+import os
+import threading
+import pickle
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+# Corpus the Autocorrection checker is built from
+CORPUS_FILE = "autocorrect_package/corpus2.txt"
+
+# Completions shown for a word that is the start of known words
+PREFIX_SUGGESTIONS = 10
+
+# Most recently checked sentences whose grammar matches are kept, also across sessions
+GRAMMAR_CACHE_SIZE = 256
+GRAMMAR_CACHE_FILE = os.path.expanduser("~/.autocorrect_grammar_cache.pkl")
+
+# Sentence-ending punctuation
+SENTENCE_ENDINGS = ".!?"
+# Characters read from the end of the text when looking for the last sentence (grows if it is longer)
+GRAMMAR_TAIL_CHARS = 500
+
+# LanguageTool server settings: cache results server-side and let checks run in parallel
+LANGUAGETOOL_CONFIG = {'cacheSize': 10000, 'pipelineCaching': True, 'maxCheckThreads': 4}
+# A typed word and its trailing punctuation
+WORD_PUNCT_RE = re.compile(r"([\w']+)([.,;!?:]*)")
+
+# Modifier keys change neither the text nor the cursor, so releasing them needs no new suggestions
+MODIFIER_KEYSYMS = frozenset({"Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R",
+                              "Meta_L", "Meta_R", "Super_L", "Super_R", "Caps_Lock"})
 
 class AutoCorrectApp(tk.Tk):
     def __init__(self):
         super().__init__()
 
-        # Initialize the Autocorrection object with the desired file
-        self.checker = Autocorrection("autocorrect_package/corpus2.txt")
-
-        # Initialize the grammar checker
-        self.grammar_tool = language_tool_python.LanguageTool('en-US')
+        # Initialize the Autocorrection object in the background, so building its indexes doesn't delay the window;
+        # suggestions and corrections are skipped until it is ready
+        self.checker = None
+        self.suggest_cache = None
+        threading.Thread(target=self.init_checker, daemon=True).start()
+
+        # Initialize the grammar checker in the background, since starting LanguageTool's JVM takes seconds;
+        # until it is ready, the latest grammar check waits in waiting_grammar_check
+        self.grammar_tool = None
+        self.waiting_grammar_check = None
+        threading.Thread(target=self.init_grammar_tool, daemon=True).start()
+        # Grammar matches by exact sentence text (match offsets are relative to it), oldest first
+        self.grammar_cache = self.load_grammar_cache()
+        # Grammar checks run on one background thread; only the latest request's result is shown
+        self.grammar_executor = ThreadPoolExecutor(max_workers=1)
+        self.grammar_request_id = 0
+        self.grammar_future = None
+        # Pending after() id of the debounced grammar check, and the sentences ended since the last one
+        self.pending_grammar_check = None
+        self.sentences_ended = 0
+        # (sentence, start index) of the last grammar check, to skip checking it again unchanged
+        self.last_grammar_check = None
 
         # Create an input box(Text widget) for the user to type
         self.input_box = tk.Text(self, wrap="word")
@@ -31,6 +77,9 @@ class AutoCorrectApp(tk.Tk):
 
         # Initialize grammar popup as None (will be created when needed)
         self.grammar_popup = None
+        # Suggestion rows of the popup, kept and reconfigured between checks instead of being recreated
+        self.grammar_buttons = []
+        self.grammar_labels = []
 
         # Bind the key release event to call the on_key_release method
         self.input_box.bind("<KeyRelease>", self.on_key_release)
@@ -48,7 +97,16 @@ class AutoCorrectApp(tk.Tk):
         # Initialize a variable to store the current word being typed
         self.current_word = ""
 
+        # Pending after() id for the debounced suggestion update, the (previous word, word) last shown
+        # and the words currently in the listbox
+        self.pending_suggestions = None
+        self.last_suggestion_key = None
+        self.shown_suggestions = []
+
     def on_key_release(self, event):
+        if event.keysym in MODIFIER_KEYSYMS:
+            return
+
         # Get the current position of the cursor(insertion point)
         cursor_position = self.input_box.index(tk.INSERT)
 
@@ -57,7 +115,14 @@ class AutoCorrectApp(tk.Tk):
         self.current_word = current_line[-1] if current_line else ""
         self.previous_word = current_line[-2] if len(current_line) > 1 else ""
 
-        # Show suggestions immediately as the user types
+        # Show suggestions once typing pauses, so a burst of keystrokes needs only one lookup
+        if self.pending_suggestions is not None:
+            self.after_cancel(self.pending_suggestions)
+        self.pending_suggestions = self.after(150, self.run_autocorrect_suggestions)
+
+    def run_autocorrect_suggestions(self):
+        # Run the suggestion update scheduled by on_key_release
+        self.pending_suggestions = None
         self.autocorrect_suggestions()
 
     def on_space_bar_press(self, event):
@@ -72,7 +137,7 @@ class AutoCorrectApp(tk.Tk):
         prev_word = self.previous_word.lower() if hasattr(self, 'previous_word') else ""
 
         # Separate trailing punctuation from the word
-        match = re.match(r"([\w']+)([.,;!?:]*)", word)
+        match = WORD_PUNCT_RE.match(word)
         if match:
             word_part = match.group(1).lower()
             punct_part = match.group(2)
@@ -80,17 +145,17 @@ class AutoCorrectApp(tk.Tk):
             word_part = word.lower()
             punct_part = ""
 
-        # Perform the autocorrection logic using the Autocorrection class (context-aware)
-        corrections = self.checker.correct_spelling_with_context(prev_word, word_part)
-        if not corrections:
-            return
+        # While the checker is still loading, the word is left as typed (the grammar check below still runs)
+        corrections = None
+        if self.suggest_cache is not None:
+            # Perform the autocorrection logic using the Autocorrection class (context-aware)
+            corrections = self.suggest_cache(prev_word, word_part)
+            if not corrections:
+                return
 
-        # Get the word with the highest probability from the corrections list
+        # Get the best ranked word from the corrections list (ranked by the checker's combined score)
         if corrections:
-            probs = np.array([c[1] for c in corrections])
-            best_ix = np.argmax(probs)
-            correct = corrections[0][0]
-            highest_prob_word = correct
+            highest_prob_word = corrections[0][0]
         
             # Replace the wrong word with the word with the highest probability, preserving punctuation
             if highest_prob_word != word_part or punct_part:
@@ -102,54 +167,38 @@ class AutoCorrectApp(tk.Tk):
         self.current_word = ""
 
         # --- Grammar checking logic ---
-        # Get the full text and check the last sentence
-        full_text = self.input_box.get("1.0", tk.END)
-        sentences = full_text.strip().split('.')
-        if len(sentences) > 1:
-            last_sentence = sentences[-2] + '.'  # The sentence just completed
-            # Calculate the start index of the last sentence
-            start_idx = full_text.rfind(last_sentence)
-        else:
-            last_sentence = sentences[-1]
-            start_idx = full_text.rfind(last_sentence)
-        matches = self.grammar_tool.check(last_sentence)
-
-        # Remove previous highlights
-        self.input_box.tag_remove("grammar_error", "1.0", tk.END)
-
-        if matches:
-            suggestions = []
-            for i, match in enumerate(matches):
-                suggestions.append(f"{match.context}\n→ {match.message}")
-                # Highlight the error in the Text widget
-                error_start = start_idx + match.offset
-                error_end = error_start + match.errorLength
-                # Convert to Tkinter index
-                start_index = f"1.0+{error_start}c"
-                end_index = f"1.0+{error_end}c"
-                self.input_box.tag_add("grammar_error", start_index, end_index)
-            self.grammar_label.config(text="\n".join(suggestions))
-            self.show_grammar_popup(matches, start_idx)
-        else:
-            self.grammar_label.config(text="")
+        # Check the last completed sentence once typing pauses
+        self.schedule_grammar_check()
 
     def autocorrect_suggestions(self):
         # Get the current and previous word being typed by the user
         word = self.current_word.lower()
         prev_word = self.previous_word.lower() if hasattr(self, 'previous_word') else ""
-        if len(word) < 3:
+        if len(word) < 3 or self.suggest_cache is None:
             return
 
-        # Perform the autocorrection logic using the Autocorrection class (context-aware)
-        corrections = self.checker.correct_spelling_with_context(prev_word, word)
+        # Keys that didn't change the word (arrows, shift, ...) leave the shown suggestions as they are
+        if (prev_word, word) == self.last_suggestion_key:
+            return
+        self.last_suggestion_key = (prev_word, word)
+
+        # A word still being typed is usually the start of a known word: offer its most frequent completions,
+        # which a binary search over the sorted vocabulary finds, and only rank spelling corrections otherwise
+        suggestions = self.checker.complete_prefix(word, PREFIX_SUGGESTIONS)
+        if not suggestions:
+            # Perform the autocorrection logic using the Autocorrection class (context-aware)
+            corrections = self.suggest_cache(prev_word, word)
+            suggestions = [correction[0] for correction in corrections or ()]
+
+        # Typing on often leaves the suggestions unchanged, so only rebuild the listbox when they differ
+        if suggestions == self.shown_suggestions:
+            return
+        self.shown_suggestions = suggestions
 
-        # Clear the existing suggestions from the listbox
+        # Replace the suggestions in the listbox
         self.suggestion_listbox.delete(0, tk.END)
-
-        # Show the suggestions in the listbox
-        if corrections:
-            for correction in corrections:
-                self.suggestion_listbox.insert(tk.END, correction[0])
+        if suggestions:
+            self.suggestion_listbox.insert(tk.END, *suggestions)
     
     def on_listbox_select(self, event):
         # Get the selected word from the listbox
@@ -161,23 +210,119 @@ class AutoCorrectApp(tk.Tk):
 
         # Clear the existing suggestions from the listbox after selecting one
         self.suggestion_listbox.delete(0, tk.END)
+        self.last_suggestion_key = None
+        self.shown_suggestions = []
 
     def on_sentence_end(self, event):
         # Trigger grammar checking logic after sentence-ending punctuation
-        self.grammar_check_last_sentence()
+        self.sentences_ended += 1
+        self.schedule_grammar_check()
+
+    def schedule_grammar_check(self):
+        # Coalesce the grammar checks of a burst of typing into one, run 250 ms after the last trigger
+        if self.pending_grammar_check is not None:
+            self.after_cancel(self.pending_grammar_check)
+        self.pending_grammar_check = self.after(250, self.run_grammar_check)
+
+    def run_grammar_check(self):
+        self.pending_grammar_check = None
+        sentences_ended, self.sentences_ended = self.sentences_ended, 0
+        if sentences_ended > 1:
+            # Several sentences ended in the burst: check the whole text in one request, not one per sentence
+            self.check_grammar(self.input_box.get("1.0", "end-1c"), 0)
+        else:
+            self.grammar_check_last_sentence()
 
     def grammar_check_last_sentence(self):
-        full_text = self.input_box.get("1.0", tk.END)
-        # Find the last sentence ending with ., !, or ?
-        import re
-        sentences = re.split(r'([.!?])', full_text.strip())
-        if len(sentences) >= 3:
-            last_sentence = sentences[-3] + sentences[-2]  # sentence + punctuation
-            start_idx = full_text.rfind(last_sentence)
-        else:
-            last_sentence = sentences[0]
-            start_idx = full_text.rfind(last_sentence)
-        matches = self.grammar_tool.check(last_sentence)
+        # Only the end of the text is needed: read a tail of it, doubling the tail until it also holds
+        # the ending before the last sentence (or is the whole text)
+        window = GRAMMAR_TAIL_CHARS
+        while True:
+            tail_start = self.input_box.index(f"end-1c-{window}c")
+            text = self.input_box.get(tail_start, "end-1c").rstrip()
+            # Find the last sentence ending with ., !, or ?: it starts just after the ending before it.
+            # rfind on the single ending characters gives its offsets without searching for the sentence text.
+            end_idx = max(text.rfind(c) for c in SENTENCE_ENDINGS) + 1
+            start_idx = max(text.rfind(c, 0, end_idx - 1) for c in SENTENCE_ENDINGS) + 1 if end_idx > 0 else 0
+            if start_idx > 0 or tail_start == "1.0":
+                break
+            window *= 2
+        if end_idx == 0:
+            # No sentence has ended yet, so check the whole text
+            start_idx, end_idx = len(text) - len(text.lstrip()), len(text)
+        # Offsets are relative to the tail; the grammar highlights need them relative to the whole text
+        tail_offset = (self.input_box.count("1.0", tail_start, "chars") or (0,))[0]
+        self.check_grammar(text[start_idx:end_idx], tail_offset + start_idx)
+
+    def check_grammar(self, sentence, start_idx):
+        # The same sentence at the same place was checked last time and is still highlighted
+        if (sentence, start_idx) == self.last_grammar_check:
+            return
+        self.last_grammar_check = (sentence, start_idx)
+
+        # A check still waiting in the queue is out of date now, so drop it
+        if self.grammar_future is not None:
+            self.grammar_future.cancel()
+        self.grammar_request_id += 1
+        request_id = self.grammar_request_id
+
+        # Sentences checked before, in this session or an earlier one, don't go back to LanguageTool
+        matches = self.grammar_cache.get(sentence)
+        if matches is not None:
+            self.grammar_cache.move_to_end(sentence)
+            self.apply_grammar_matches(matches, start_idx)
+            return
+
+        # LanguageTool is still starting: keep only the latest check and run it once the tool is ready
+        if self.grammar_tool is None:
+            self.waiting_grammar_check = (sentence, start_idx)
+            self.last_grammar_check = None
+            return
+
+        # Run the check on the background thread and hand the result back to the Tk main thread
+        future = self.grammar_future = self.grammar_executor.submit(self.grammar_tool.check, sentence)
+        future.add_done_callback(lambda f: self.after(0, self.finish_grammar_check, request_id, f, sentence, start_idx))
+
+    def init_checker(self):
+        # Runs on a background thread; the loaded checker is handed to the Tk main thread
+        checker = Autocorrection(CORPUS_FILE)
+        self.after(0, self.checker_ready, checker)
+
+    def checker_ready(self, checker):
+        self.checker = checker
+        # Remember corrections per (previous word, word), as the same pairs come up again while typing
+        self.suggest_cache = lru_cache(maxsize=2048)(checker.correct_spelling_with_context)
+        # Show suggestions for a word typed while the checker was loading
+        self.autocorrect_suggestions()
+
+    def init_grammar_tool(self):
+        # Runs on a background thread; the finished tool is handed to the Tk main thread
+        try:
+            grammar_tool = language_tool_python.LanguageTool('en-US', config=LANGUAGETOOL_CONFIG)
+        except Exception as e:
+            print(f"Could not start LanguageTool: {e}")
+            return
+        self.after(0, self.grammar_tool_ready, grammar_tool)
+
+    def grammar_tool_ready(self, grammar_tool):
+        self.grammar_tool = grammar_tool
+        if self.waiting_grammar_check is not None:
+            sentence, start_idx = self.waiting_grammar_check
+            self.waiting_grammar_check = None
+            self.check_grammar(sentence, start_idx)
+
+    def finish_grammar_check(self, request_id, future, sentence, start_idx):
+        if future.cancelled():
+            return
+        matches = future.result()
+        self.grammar_cache[sentence] = matches
+        if len(self.grammar_cache) > GRAMMAR_CACHE_SIZE:
+            self.grammar_cache.popitem(last=False)
+        # A newer sentence was sent since this one, so its result is no longer shown
+        if request_id == self.grammar_request_id:
+            self.apply_grammar_matches(matches, start_idx)
+
+    def apply_grammar_matches(self, matches, start_idx):
         # Remove previous highlights
         self.input_box.tag_remove("grammar_error", "1.0", tk.END)
         if matches:
@@ -195,6 +340,24 @@ class AutoCorrectApp(tk.Tk):
         else:
             self.grammar_label.config(text="")
 
+    def load_grammar_cache(self):
+        # Start from the grammar matches saved by the last session, if there are any
+        try:
+            with open(GRAMMAR_CACHE_FILE, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return OrderedDict()
+        except Exception as e:
+            print(f"Could not load grammar cache: {e}")
+            return OrderedDict()
+
+    def save_grammar_cache(self):
+        try:
+            with open(GRAMMAR_CACHE_FILE, 'wb') as f:
+                pickle.dump(self.grammar_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"Could not save grammar cache: {e}")
+
     def show_grammar_popup(self, matches, start_idx):
         # Create popup only if it doesn't exist
         if self.grammar_popup is None:
@@ -210,6 +373,10 @@ class AutoCorrectApp(tk.Tk):
             # Create a frame to hold all suggestions
             self.suggestions_frame = tk.Frame(self.grammar_popup)
             self.suggestions_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+            # Add title
+            title_label = tk.Label(self.suggestions_frame, text="Grammar Suggestions:", fg="blue", font=("Arial", 12, "bold"))
+            title_label.pack(anchor="w", pady=(0, 10))
             
             # Add a close button
             close_btn = tk.Button(self.grammar_popup, text="Close", command=self.close_grammar_popup)
@@ -218,35 +385,38 @@ class AutoCorrectApp(tk.Tk):
             # Force focus back to text widget after popup creation
             self.after(100, self.input_box.focus_set)
         
-        # Clear previous suggestions
-        for widget in self.suggestions_frame.winfo_children():
-            widget.destroy()
+        # Hide the previous suggestions; their widgets are reused below, in the order of the new matches
+        for row in self.grammar_buttons + self.grammar_labels:
+            row.pack_forget()
         
-        # Add title
-        title_label = tk.Label(self.suggestions_frame, text="Grammar Suggestions:", fg="blue", font=("Arial", 12, "bold"))
-        title_label.pack(anchor="w", pady=(0, 10))
-        
-        # Add new suggestions
-        for i, match in enumerate(matches):
+        # Add new suggestions, creating rows only when there are more than before
+        buttons_used = labels_used = 0
+        for match in matches:
             suggestion = match.replacements[0] if match.replacements else None
             if suggestion:
-                btn = tk.Button(
-                    self.suggestions_frame,
+                if buttons_used == len(self.grammar_buttons):
+                    self.grammar_buttons.append(tk.Button(self.suggestions_frame, wraplength=380, justify="left", anchor="w"))
+                btn = self.grammar_buttons[buttons_used]
+                buttons_used += 1
+                btn.config(
                     text=f"Replace '{match.context[match.offset:match.offset+match.errorLength]}' with '{suggestion}'\n→ {match.message}",
-                    wraplength=380,
-                    justify="left",
-                    anchor="w",
                     command=lambda m=match, s=suggestion: self.apply_grammar_correction(m, s, start_idx)
                 )
                 btn.pack(fill="x", pady=2)
             else:
-                lbl = tk.Label(self.suggestions_frame, text=f"{match.context}\n→ {match.message}", wraplength=380, justify="left", fg="gray")
+                if labels_used == len(self.grammar_labels):
+                    self.grammar_labels.append(tk.Label(self.suggestions_frame, wraplength=380, justify="left", fg="gray"))
+                lbl = self.grammar_labels[labels_used]
+                labels_used += 1
+                lbl.config(text=f"{match.context}\n→ {match.message}")
                 lbl.pack(fill="x", pady=2)
 
     def close_grammar_popup(self):
         if self.grammar_popup:
             self.grammar_popup.destroy()
             self.grammar_popup = None
+            self.grammar_buttons = []
+            self.grammar_labels = []
 
     def apply_grammar_correction(self, match, suggestion, start_idx):
         # Calculate the error's absolute position in the text
@@ -259,24 +429,16 @@ class AutoCorrectApp(tk.Tk):
         self.input_box.insert(start_index, suggestion)
         # Remove highlights
         self.input_box.tag_remove("grammar_error", "1.0", tk.END)
-        # Update the popup with remaining suggestions or close if none
-        self.update_grammar_popup()
-
-    def update_grammar_popup(self):
-        # Re-check for grammar errors and update popup
-        full_text = self.input_box.get("1.0", tk.END)
-        matches = self.grammar_tool.check(full_text)
-        if matches:
-            # Find the position of the first error for highlighting
-            first_match = matches[0]
-            start_idx = 0  # For full text check
-            self.show_grammar_popup(matches, start_idx)
-        else:
-            # No more errors, close popup
-            self.close_grammar_popup()
+        self.last_grammar_check = None
+        # The popup's other suggestions point at the text before the edit, so close it; re-checking the
+        # text in the background reopens it with the remaining suggestions, if there are any
+        self.close_grammar_popup()
+        self.check_grammar(self.input_box.get("1.0", "end-1c"), 0)
 
     def run(self):
         self.mainloop()
+        # Keep this session's grammar matches for the next one
+        self.save_grammar_cache()
 
 if __name__ == "__main__":
     app = AutoCorrectApp()
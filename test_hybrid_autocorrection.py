@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Test script for the hybrid autocorrection candidates
+Checks that swapped letters are still corrected as one edit.
+"""
+
+from autocorrect_package.hybrid_autocorrection import HybridAutocorrection
+
+def test_swap_candidates():
+    """Test that adjacent swaps are found alongside other one-edit words."""
+
+    # Only the original corpus, and no vocabulary cache file
+    corrector = HybridAutocorrection(use_large_corpora=False, cache_file=None)
+
+    for misspelling, expected in [("teh", "the"), ("adn", "and"), ("wrod", "word")]:
+        candidates = corrector.candidates(misspelling)
+        print(f"'{misspelling}' → {sorted(candidates)}")
+        assert expected in candidates
+
+def test_accepted_feedback_ranks_higher():
+    """Test that a suggestion the user accepted moves up the ranking."""
+
+    corrector = HybridAutocorrection(use_large_corpora=False, cache_file=None)
+    candidates = corrector.candidates("teh")
+    before = corrector.rank_candidates(candidates, "teh", [])
+    print(f"Before feedback: {before[:5]}")
+
+    # Set the feedback directly, as record_user_feedback also saves it to custom_words.json
+    corrector.user_feedback["teh"] = {"the": {"accepted": 3, "rejected": 0}}
+    after = corrector.rank_candidates(candidates, "teh", [])
+    print(f"After feedback: {after[:5]}")
+    assert after.index("the") < before.index("the")
+
+if __name__ == "__main__":
+    test_swap_candidates()
+    test_accepted_feedback_ranks_higher()